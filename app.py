@@ -1,17 +1,45 @@
+import atexit
+import base64
+import concurrent.futures
+import csv
+import functools
+import gzip
+import hashlib
+import hmac
+import html
+import io
+import itertools
+import json
 import os
-import smtplib
+import queue
+import re
+import string
+import tempfile
+import threading
+import time
+import zlib
 import pytz
-from datetime import datetime, date
-from email.message import EmailMessage
-from typing import List
+from datetime import datetime, date, timedelta
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from dotenv import load_dotenv
 load_dotenv()
 
-from flask import Flask, request, jsonify
+try:
+    import brotli
+except ImportError:  # optional: pages are served gzip-only without it
+    brotli = None
+
+from flask import Flask, g, has_request_context, request, jsonify, stream_with_context, url_for
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
-from apscheduler.schedulers.background import BackgroundScheduler
-from sqlalchemy import func
+import prometheus_client
+from prometheus_client import multiprocess
+from sqlalchemy import and_, event, func, inspect, insert, or_, select, text, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import IntegrityError
+from werkzeug.http import http_date
 
 # --- 1. App Initialization and Configuration ---
 app = Flask(__name__) # No longer need template_folder
@@ -22,14 +50,86 @@ origins = [
     "http://127.0.0.1:8000",
     # Add your production frontend domains here
 ]
-CORS(app, resources={r"/*": {"origins": origins}})
+CORS(app, resources={r"/*": {"origins": origins}}, expose_headers=["Link", "X-Next-Cursor", "X-Prev-Cursor"])
 
 # Configure the database
 app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///database.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+# Engine tuning. SQLite gets WAL so readers don't block the writer and a busy timeout so
+# concurrent gunicorn workers wait for the write lock instead of failing with
+# "database is locked". PostgreSQL gets a configurable pool and statement timeout.
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL").upper()
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL").upper()
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ('1', 'true', 'yes')
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 0))
+
+if SQLITE_JOURNAL_MODE not in ('DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF'):
+    raise ValueError(f"Unsupported SQLITE_JOURNAL_MODE: {SQLITE_JOURNAL_MODE}")
+if SQLITE_SYNCHRONOUS not in ('OFF', 'NORMAL', 'FULL', 'EXTRA'):
+    raise ValueError(f"Unsupported SQLITE_SYNCHRONOUS: {SQLITE_SYNCHRONOUS}")
+
+def engine_options(database_uri: str) -> dict:
+    if make_url(database_uri).get_backend_name() != 'postgresql':
+        return {}
+    options = {
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'pool_timeout': DB_POOL_TIMEOUT,
+        'pool_recycle': DB_POOL_RECYCLE,
+        'pool_pre_ping': DB_POOL_PRE_PING,
+    }
+    if DB_STATEMENT_TIMEOUT_MS:
+        options['connect_args'] = {'options': f'-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}'}
+    return options
+
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config['SQLALCHEMY_DATABASE_URI'])
+
+# Timezone that decides what "today" means for /words/today, and the default timezone of
+# subscribers who did not choose one.
+APP_TIMEZONE = pytz.timezone(os.getenv("APP_TIMEZONE", "US/Eastern"))
+# Default local hour at which subscribers receive the email, and the minute past each hour
+# at which the hourly dispatcher runs.
+DEFAULT_SEND_HOUR = int(os.getenv("HOUR") or 8)
+DELIVERY_MINUTE = int(os.getenv("MINUTE") or 0)
+
 db = SQLAlchemy(app)
 
+def _configure_sqlite_connection(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.close()
+
+with app.app_context():
+    if db.engine.dialect.name == 'sqlite':
+        event.listen(db.engine, 'connect', _configure_sqlite_connection)
+
+def report_engine_settings():
+    """Print the database settings actually in effect, as reported by the database itself."""
+    with app.app_context():
+        engine = db.engine
+        url = engine.url.render_as_string(hide_password=True)
+        with engine.connect() as connection:
+            if engine.dialect.name == 'sqlite':
+                journal_mode = connection.exec_driver_sql("PRAGMA journal_mode").scalar()
+                synchronous = {0: 'OFF', 1: 'NORMAL', 2: 'FULL', 3: 'EXTRA'}.get(connection.exec_driver_sql("PRAGMA synchronous").scalar())
+                busy_timeout = connection.exec_driver_sql("PRAGMA busy_timeout").scalar()
+                print(f"Database {url}: journal_mode={journal_mode}, synchronous={synchronous}, busy_timeout={busy_timeout}ms")
+            elif engine.dialect.name == 'postgresql':
+                statement_timeout = connection.exec_driver_sql("SHOW statement_timeout").scalar()
+                print(f"Database {url}: pool_size={DB_POOL_SIZE}, max_overflow={DB_MAX_OVERFLOW}, "
+                      f"pool_timeout={DB_POOL_TIMEOUT}s, pool_recycle={DB_POOL_RECYCLE}s, "
+                      f"pool_pre_ping={DB_POOL_PRE_PING}, statement_timeout={statement_timeout}")
+            else:
+                print(f"Database {url}: {engine.dialect.name} with default engine settings")
+
 # --- 2. Embedded HTML Content ---
 
 INDEX_HTML = """
@@ -150,7 +250,7 @@ INDEX_HTML = """
             messageDiv.textContent = '';
             messageDiv.className = '';
             showLoading(true);
-            const formData = { name: document.getElementById('name').value, email: document.getElementById('email').value };
+            const formData = { name: document.getElementById('name').value, email: document.getElementById('email').value, detected_timezone: Intl.DateTimeFormat().resolvedOptions().timeZone };
             const fetchOptions = { method: 'POST', headers: { 'Content-Type': 'application/json' }, body: JSON.stringify(formData) };
             try {
                 const response = await fetch(usersApiUrl, fetchOptions);
@@ -213,7 +313,11 @@ ADMIN_HTML = """
             font-family: 'Courier New', Courier, monospace; background-color: #f8f9fa;
             resize: vertical; transition: border-color 0.2s, box-shadow 0.2s;
         }
-        textarea:focus {
+        input[type="password"] {
+            width: 100%; padding: 0.75rem 1rem; border: 1px solid var(--border-color); border-radius: 8px;
+            box-sizing: border-box; font-size: 0.9rem; margin-bottom: 1rem;
+        }
+        textarea:focus, input[type="password"]:focus {
             border-color: var(--primary-color); box-shadow: 0 0 0 3px rgba(217, 72, 15, 0.2); outline: none;
         }
         button {
@@ -233,6 +337,7 @@ ADMIN_HTML = """
         <h1>Bulk Word Upload</h1>
         <p class="description">Paste a JSON array of word objects into the text area below.</p>
         <form id="bulkUploadForm">
+            <input type="password" id="adminToken" placeholder="Admin token" autocomplete="current-password" required>
             <textarea id="jsonInput" placeholder='[{
   "title": "Immutable",
   "description": "Unchanging over time or unable to be changed.",
@@ -246,6 +351,7 @@ ADMIN_HTML = """
     <script>
         const uploadForm = document.getElementById('bulkUploadForm');
         const jsonInput = document.getElementById('jsonInput');
+        const adminToken = document.getElementById('adminToken');
         const messageDiv = document.getElementById('message');
         uploadForm.addEventListener('submit', async function(event) {
             event.preventDefault();
@@ -262,7 +368,8 @@ ADMIN_HTML = """
                 return;
             }
             const apiUrl = '/words/bulk';
-            const fetchOptions = { method: 'POST', headers: { 'Content-Type': 'application/json' }, body: JSON.stringify(words) };
+            const headers = { 'Content-Type': 'application/json', 'Authorization': `Bearer ${adminToken.value}` };
+            const fetchOptions = { method: 'POST', headers: headers, body: JSON.stringify(words) };
             try {
                 const response = await fetch(apiUrl, fetchOptions);
                 const result = await response.json();
@@ -290,9 +397,14 @@ class User(db.Model):
     name = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
     joined_date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    # Delivery bucket: the subscriber gets the email at send_hour local time in their timezone.
+    timezone = db.Column(db.String(64), nullable=False, default=lambda: APP_TIMEZONE.zone)
+    send_hour = db.Column(db.Integer, nullable=False, default=lambda: DEFAULT_SEND_HOUR)
+    __table_args__ = (db.Index('ix_user_delivery_bucket', 'timezone', 'send_hour', 'id'),)
 
     def to_dict(self):
-        return {'id': self.id, 'name': self.name, 'email': self.email, 'joined_date': self.joined_date.isoformat()}
+        return {'id': self.id, 'name': self.name, 'email': self.email, 'joined_date': self.joined_date.isoformat(),
+                'timezone': self.timezone, 'send_hour': self.send_hour}
 
 class Word(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -304,74 +416,980 @@ class Word(db.Model):
     def to_dict(self):
         return {'id': self.id, 'title': self.title, 'description': self.description, 'example': self.example, 'published_date': self.published_date}
 
+class Counter(db.Model):
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+class DeliveryRun(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    run_date = db.Column(db.Date, nullable=False, unique=True, index=True)
+    word_id = db.Column(db.Integer, db.ForeignKey('word.id'), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='running')
+    attempts = db.Column(db.Integer, nullable=False, default=1)
+    sent_count = db.Column(db.Integer, nullable=False, default=0)
+    failed_count = db.Column(db.Integer, nullable=False, default=0)
+    started_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime)
+    # JSON list of the [timezone, send_hour] buckets dispatched so far, so a resume covers them all.
+    buckets = db.Column(db.Text, nullable=False, default='[]')
+
+    def to_dict(self):
+        return {'id': self.id, 'run_date': self.run_date.isoformat(), 'word_id': self.word_id, 'status': self.status,
+                'attempts': self.attempts, 'sent_count': self.sent_count, 'failed_count': self.failed_count}
+
+class Delivery(db.Model):
+    __table_args__ = (db.UniqueConstraint('run_id', 'email'),)
+    id = db.Column(db.Integer, primary_key=True)
+    run_id = db.Column(db.Integer, db.ForeignKey('delivery_run.id'), nullable=False)
+    email = db.Column(db.String(120), nullable=False)
+    # 'sent', 'failed' (transient, retried up to DELIVERY_MAX_ATTEMPTS) or 'rejected' (permanent).
+    status = db.Column(db.String(20), nullable=False)
+    attempts = db.Column(db.Integer, nullable=False, default=1)
+    error = db.Column(db.String(255))
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+# The embedded pages never change while the process runs, so they are minified and
+# compressed once here and served with strong ETags.
+PAGE_CACHE_MAX_AGE = int(os.getenv("PAGE_CACHE_MAX_AGE", 86400))
+_PRESERVE_WHITESPACE = re.compile(r'(<textarea\b.*?</textarea>|<pre\b.*?</pre>)', re.DOTALL | re.IGNORECASE)
+
+def minify_html(page: str) -> str:
+    """Drop indentation and blank lines, leaving <textarea>/<pre> content untouched."""
+    parts = _PRESERVE_WHITESPACE.split(page)
+    for i in range(0, len(parts), 2):
+        parts[i] = '\n'.join(line.strip() for line in parts[i].splitlines() if line.strip())
+    return ''.join(parts).strip()
+
+class StaticPage:
+    def __init__(self, page: str):
+        body = minify_html(page).encode('utf-8')
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        # Each encoding is a different representation and needs its own strong ETag.
+        self.variants = {'identity': (body, digest), 'gzip': (gzip.compress(body, 9, mtime=0), f'{digest}-gz')}
+        if brotli is not None:
+            self.variants['br'] = (brotli.compress(body, quality=11), f'{digest}-br')
+
+    def _negotiate(self) -> str:
+        accepted = request.accept_encodings
+        best, best_quality = 'identity', 0
+        for encoding in ('br', 'gzip'):
+            quality = accepted[encoding]
+            if encoding in self.variants and quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def response(self):
+        encoding = self._negotiate()
+        body, etag = self.variants[encoding]
+        if request.if_none_match.contains(etag):
+            response = app.response_class(status=304)
+        else:
+            response = app.response_class(body, mimetype='text/html')
+            if encoding != 'identity':
+                response.headers['Content-Encoding'] = encoding
+        response.set_etag(etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = PAGE_CACHE_MAX_AGE
+        response.vary.add('Accept-Encoding')
+        return response
+
+INDEX_PAGE = StaticPage(INDEX_HTML)
+ADMIN_PAGE = StaticPage(ADMIN_HTML)
+
 @app.route('/')
 def index_page():
-    return INDEX_HTML
+    return INDEX_PAGE.response()
 
 @app.route('/admin')
 def admin_page():
-    return ADMIN_HTML
+    return ADMIN_PAGE.response()
+
+
+# --- 4. Metrics ---
+# Prometheus metrics. Under gunicorn, PROMETHEUS_MULTIPROC_DIR (set by gunicorn.conf.py)
+# makes every worker write its samples to shared mmap files that /metrics aggregates.
+REQUEST_LATENCY = prometheus_client.Histogram('http_request_duration_seconds', 'Request latency by route.', ['method', 'route', 'status'])
+REQUESTS_IN_FLIGHT = prometheus_client.Gauge('http_requests_in_flight', 'Requests currently being handled.', ['route'], multiprocess_mode='livesum')
+DB_QUERIES_PER_REQUEST = prometheus_client.Histogram('db_queries_per_request', 'SQL statements executed per request.', ['route'],
+                                                     buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100))
+DB_TIME_PER_REQUEST = prometheus_client.Histogram('db_time_per_request_seconds', 'Time spent in SQL statements per request.', ['route'])
+DB_QUERY_DURATION = prometheus_client.Histogram('db_query_duration_seconds', 'Execution time of a single SQL statement.')
+DB_POOL_CHECKOUT = prometheus_client.Histogram('db_pool_checkout_seconds', 'Time spent waiting for a pooled database connection.')
+EMAIL_SEND_LATENCY = prometheus_client.Histogram('email_send_duration_seconds', 'Time to hand one message to the SMTP relay.')
+EMAIL_RECIPIENTS = prometheus_client.Counter('email_recipients_total', 'Recipients processed by the email job.', ['result'])
+EMAIL_JOB_RATE = prometheus_client.Gauge('email_job_recipients_per_second', 'Throughput of the most recent email job.', multiprocess_mode='mostrecent')
+SIGNUP_BATCH_SIZE = prometheus_client.Histogram('signup_batch_size', 'Signups written per group commit.',
+                                               buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500))
+
+def _route_label() -> str:
+    # The URL rule, not the path, so label cardinality stays bounded.
+    return request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+@app.before_request
+def _start_request_metrics():
+    g.metrics_route = _route_label()
+    g.metrics_started = time.perf_counter()
+    g.db_queries = 0
+    g.db_time = 0.0
+    REQUESTS_IN_FLIGHT.labels(g.metrics_route).inc()
+
+@app.after_request
+def _record_response_status(response):
+    g.metrics_status = response.status_code
+    return response
+
+@app.teardown_request
+def _finish_request_metrics(exc):
+    route = g.pop('metrics_route', None)
+    if route is None:
+        return
+    REQUESTS_IN_FLIGHT.labels(route).dec()
+    status = g.pop('metrics_status', 500)
+    REQUEST_LATENCY.labels(request.method, route, str(status)).observe(time.perf_counter() - g.metrics_started)
+    DB_QUERIES_PER_REQUEST.labels(route).observe(g.db_queries)
+    DB_TIME_PER_REQUEST.labels(route).observe(g.db_time)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_started'].pop()
+    DB_QUERY_DURATION.observe(elapsed)
+    if has_request_context():
+        g.db_queries = g.get('db_queries', 0) + 1
+        g.db_time = g.get('db_time', 0.0) + elapsed
+
+def instrument_engine(engine):
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+    _time_pool_checkout(engine.pool)
+    # dispose() swaps in a fresh pool (e.g. after a gunicorn --preload fork); time that one too.
+    event.listen(engine, 'engine_disposed', lambda engine: _time_pool_checkout(engine.pool))
+
+def _time_pool_checkout(pool):
+    # The pool has no "before checkout" event, so time the call that blocks on it.
+    connect = pool.connect
+
+    def timed_connect():
+        started = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            DB_POOL_CHECKOUT.observe(time.perf_counter() - started)
+    pool.connect = timed_connect
+
+with app.app_context():
+    instrument_engine(db.engine)
+
+@app.route('/metrics')
+def metrics():
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return app.response_class(prometheus_client.generate_latest(registry), content_type=prometheus_client.CONTENT_TYPE_LATEST)
 
 
 # --- 5. API Endpoints ---
+# Shared secret for the admin data endpoints (bulk imports, exports, count reconcile), sent as
+# "Authorization: Bearer <token>". Unset disables those endpoints.
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+def require_admin(view):
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not ADMIN_TOKEN:
+            return jsonify({'error': 'Admin endpoints are disabled; set ADMIN_TOKEN to enable them'}), 403
+        scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+        if scheme.lower() != 'bearer' or not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+            return jsonify({'error': 'Admin token required'}), 401, {'WWW-Authenticate': 'Bearer'}
+        return view(*args, **kwargs)
+    return wrapper
+
+USER_BULK_BATCH_SIZE = int(os.getenv("USER_BULK_BATCH_SIZE", 1000))
+# Only the first few invalid rows of a bulk import are echoed back.
+USER_BULK_MAX_ERRORS = 100
+
+def normalize_email(address: str) -> str:
+    # Emails are stored lower-cased so the unique constraint is effectively case-insensitive.
+    return address.strip().lower()
+
+def insert_ignoring_conflicts(model, rows: List[dict]) -> int:
+    """Insert rows in one statement, skipping any that hit a unique constraint. Returns rows inserted."""
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        return db.session.execute(postgresql_insert(model).values(rows).on_conflict_do_nothing()).rowcount
+    if dialect == 'sqlite':
+        return db.session.execute(sqlite_insert(model).values(rows).on_conflict_do_nothing()).rowcount
+    inserted = 0
+    for row in rows:
+        try:
+            with db.session.begin_nested():
+                db.session.execute(insert(model), row)
+            inserted += 1
+        except IntegrityError:
+            pass
+    return inserted
+
+def validate_delivery_preferences(data: dict) -> dict:
+    """Return the optional timezone/send_hour of a signup, or raise ValueError.
+
+    An explicit ``timezone`` must be known to pytz. A ``detected_timezone`` (what the signup
+    form reads from the browser) is only a hint: names pytz does not know, such as
+    Etc/Unknown or zones newer than the installed pytz, fall back to APP_TIMEZONE.
+    """
+    preferences = {}
+    timezone_name = data.get('timezone')
+    if timezone_name not in (None, ''):
+        if timezone_name not in pytz.all_timezones_set:
+            raise ValueError('Unknown timezone')
+        preferences['timezone'] = timezone_name
+    elif data.get('detected_timezone') in pytz.all_timezones_set:
+        preferences['timezone'] = data['detected_timezone']
+    send_hour = data.get('send_hour')
+    if send_hour not in (None, ''):
+        # CSV imports deliver every value as a string.
+        if isinstance(send_hour, str) and send_hour.strip().isdigit():
+            send_hour = int(send_hour)
+        if isinstance(send_hour, bool) or not isinstance(send_hour, int) or not 0 <= send_hour <= 23:
+            raise ValueError('send_hour must be an integer from 0 to 23')
+        preferences['send_hour'] = send_hour
+    return preferences
+
+# Group commit for POST /users/: signups from concurrent requests are queued to a per-process
+# batcher and written with one multi-row INSERT and one commit per flush. It only pays off
+# when a process serves many requests at once (gunicorn.conf.py switches to threaded
+# gthread workers when it is on); under one-request-at-a-time sync workers it only adds latency.
+USER_GROUP_COMMIT = os.getenv("USER_GROUP_COMMIT", "false").lower() in ('1', 'true', 'yes')
+USER_GROUP_COMMIT_MAX_ROWS = int(os.getenv("USER_GROUP_COMMIT_MAX_ROWS", 200))
+# How long the first queued signup may wait for more to join its batch.
+USER_GROUP_COMMIT_MAX_LATENCY_MS = float(os.getenv("USER_GROUP_COMMIT_MAX_LATENCY_MS", 5))
+# Signups waiting beyond this are refused with 503 instead of piling up.
+USER_GROUP_COMMIT_QUEUE_SIZE = int(os.getenv("USER_GROUP_COMMIT_QUEUE_SIZE", 5000))
+USER_GROUP_COMMIT_WAIT_SECONDS = float(os.getenv("USER_GROUP_COMMIT_WAIT_SECONDS", 10))
+
+class SignupBatcher:
+    """Collects signup rows from request threads and group-commits them on a background thread.
+
+    submit() returns a Future resolving to the created user's dict, or None if the email was
+    already registered (including earlier in the same batch).
+    """
+
+    def __init__(self, max_rows: int = USER_GROUP_COMMIT_MAX_ROWS, max_latency_ms: float = USER_GROUP_COMMIT_MAX_LATENCY_MS,
+                 queue_size: int = USER_GROUP_COMMIT_QUEUE_SIZE):
+        self.max_rows = max_rows
+        self.max_latency = max_latency_ms / 1000
+        self.queue = queue.Queue(queue_size)
+        self.lock = threading.Lock()
+        self.thread = None
+        self.closed = False
+
+    def submit(self, row: dict) -> concurrent.futures.Future:
+        future = concurrent.futures.Future()
+        with self.lock:
+            if self.closed:
+                raise queue.Full
+            # Started on first use, so each gunicorn worker gets its own thread after fork.
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name='signup-batcher', daemon=True)
+                self.thread.start()
+            self.queue.put_nowait((row, future))
+        return future
+
+    def close(self):
+        """Stop accepting signups and wait for the queued ones to be written."""
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            thread = self.thread
+        if thread is not None:
+            self.queue.put(None)
+            thread.join()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self.queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.max_latency
+            while len(batch) < self.max_rows:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            with app.app_context():
+                self._flush(batch)
+
+    def _flush(self, batch: List[tuple]):
+        # The first signup for an address wins; repeats within the batch are duplicates.
+        pending = {}
+        for row, future in batch:
+            # False when the request gave up waiting and withdrew its signup; it is not written.
+            if not future.set_running_or_notify_cancel():
+                continue
+            if row['email'] in pending:
+                future.set_result(None)
+            else:
+                pending[row['email']] = (row, future)
+        if not pending:
+            return
+        SIGNUP_BATCH_SIZE.observe(len(pending))
+        try:
+            created = insert_signups([row for row, _ in pending.values()])
+            increment_counter(USER_COUNTER, len(created))
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"Group commit of {len(pending)} signups failed, inserting them one by one: {e}")
+            self._flush_one_by_one(pending.values())
+            return
+        if created:
+            user_count_cache.invalidate()
+        for email, (row, future) in pending.items():
+            future.set_result(created.get(email))
+
+    def _flush_one_by_one(self, pending: Iterable[tuple]):
+        # Isolates a bad row so it cannot fail the other signups in its batch.
+        for row, future in pending:
+            try:
+                created = insert_signups([row])
+                increment_counter(USER_COUNTER, len(created))
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                future.set_exception(e)
+                continue
+            if created:
+                user_count_cache.invalidate()
+            future.set_result(created.get(row['email']))
+
+def insert_signups(rows: List[dict]) -> Dict[str, dict]:
+    """Insert user rows in one statement, skipping registered emails. Returns the created users by email."""
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        stmt = postgresql_insert(User).values(rows).on_conflict_do_nothing()
+    elif dialect == 'sqlite':
+        stmt = sqlite_insert(User).values(rows).on_conflict_do_nothing()
+    else:
+        created = {}
+        for row in rows:
+            try:
+                with db.session.begin_nested():
+                    created[row['email']] = db.session.execute(insert(User).returning(*User.__table__.c), row).one()
+            except IntegrityError:
+                pass
+        return {email: User(**row._mapping).to_dict() for email, row in created.items()}
+    result = db.session.execute(stmt.returning(*User.__table__.c))
+    return {row.email: User(**row._mapping).to_dict() for row in result}
+
+signup_batcher = SignupBatcher()
+atexit.register(signup_batcher.close)
+
 @app.route('/users/', methods=['POST'])
 def create_user():
     data = request.get_json()
-    if not data or 'name' not in data or 'email' not in data:
+    if not data or not isinstance(data.get('name'), str) or not isinstance(data.get('email'), str):
         return jsonify({'error': 'Missing name or email'}), 400
-    if User.query.filter_by(email=data['email']).first():
-        return jsonify({'error': 'Email already registered'}), 400
-    new_user = User(name=data['name'], email=data['email'])
+    # Too-long values would only fail at insert time (a 500 on PostgreSQL, silently stored by
+    # SQLite); reject them here like /users/bulk does.
+    if len(data['name']) > 100 or len(normalize_email(data['email'])) > 120:
+        return jsonify({'error': 'Name or email too long'}), 400
+    try:
+        preferences = validate_delivery_preferences(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if USER_GROUP_COMMIT:
+        return create_user_group_commit(data, preferences)
+    # A single INSERT; the unique index on email rejects duplicates, including concurrent ones.
+    new_user = User(name=data['name'], email=normalize_email(data['email']), **preferences)
     db.session.add(new_user)
-    db.session.commit()
+    try:
+        increment_counter(USER_COUNTER)
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'error': 'Email already registered'}), 400
+    user_count_cache.invalidate()
     return jsonify(new_user.to_dict()), 201
 
+def _signups_busy():
+    return jsonify({'error': 'Too many signups right now, please retry'}), 503, {'Retry-After': '1'}
+
+def create_user_group_commit(data: dict, preferences: dict):
+    row = {'name': data['name'], 'email': normalize_email(data['email']), 'joined_date': datetime.utcnow(),
+           'timezone': preferences.get('timezone', APP_TIMEZONE.zone),
+           'send_hour': preferences.get('send_hour', DEFAULT_SEND_HOUR)}
+    try:
+        future = signup_batcher.submit(row)
+    except queue.Full:
+        return _signups_busy()
+    try:
+        user = future.result(timeout=USER_GROUP_COMMIT_WAIT_SECONDS)
+    except concurrent.futures.TimeoutError:
+        # Withdraw the signup so a 503 really means "not registered". Once its batch is being
+        # written it cannot be withdrawn, and the request waits for the outcome instead.
+        if future.cancel():
+            return _signups_busy()
+        user = future.result()
+    if user is None:
+        return jsonify({'error': 'Email already registered'}), 400
+    return jsonify(user), 201
+
+def _iter_csv(stream) -> Iterator[dict]:
+    # utf-8-sig drops the byte-order mark Excel puts at the start of exported CSVs.
+    yield from csv.DictReader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+
+@app.route('/users/bulk', methods=['POST'])
+@require_admin
+def create_bulk_users():
+    """Import subscribers from a streamed CSV (name,email[,timezone,send_hour] header) or NDJSON body."""
+    if request.mimetype == 'text/csv':
+        rows = _iter_csv(request.stream)
+    elif request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        rows = _iter_ndjson(request.stream)
+    else:
+        return jsonify({'error': 'Body must be text/csv or application/x-ndjson'}), 415
+
+    inserted = duplicates = invalid = 0
+    errors = []
+    batch = {}
+
+    def flush():
+        nonlocal inserted, duplicates
+        count = insert_ignoring_conflicts(User, list(batch.values()))
+        increment_counter(USER_COUNTER, count)
+        db.session.commit()
+        inserted += count
+        duplicates += len(batch) - count
+
+    now = datetime.utcnow()
+    for index, row in enumerate(rows):
+        name = row.get('name') if isinstance(row, dict) else None
+        address = row.get('email') if isinstance(row, dict) else None
+        if not isinstance(name, str) or not name.strip() or not isinstance(address, str) or '@' not in address:
+            invalid += 1
+            if len(errors) < USER_BULK_MAX_ERRORS:
+                errors.append({'index': index, 'error': str(row) if isinstance(row, Exception) else 'Missing or invalid name or email'})
+            continue
+        address = normalize_email(address)
+        if len(name) > 100 or len(address) > 120:
+            invalid += 1
+            if len(errors) < USER_BULK_MAX_ERRORS:
+                errors.append({'index': index, 'error': 'Name or email too long'})
+            continue
+        try:
+            preferences = validate_delivery_preferences(row)
+        except ValueError as e:
+            invalid += 1
+            if len(errors) < USER_BULK_MAX_ERRORS:
+                errors.append({'index': index, 'error': str(e)})
+            continue
+        if address in batch:
+            duplicates += 1
+            continue
+        batch[address] = {'name': name, 'email': address, 'joined_date': now,
+                          'timezone': preferences.get('timezone', APP_TIMEZONE.zone),
+                          'send_hour': preferences.get('send_hour', DEFAULT_SEND_HOUR)}
+        if len(batch) >= USER_BULK_BATCH_SIZE:
+            flush()
+            batch = {}
+    if batch:
+        flush()
+    if inserted:
+        user_count_cache.invalidate()
+    return jsonify({'inserted': inserted, 'duplicates': duplicates, 'invalid': invalid, 'errors': errors}), 200
+
 @app.route('/words/', methods=['POST'])
 def create_word():
     data = request.get_json()
     if not all(key in data for key in ['title', 'description', 'example']):
         return jsonify({'error': 'Missing required fields'}), 400
-    new_word = Word(title=data['title'], description=data['description'], example=data['example'], published_date=data['published_date'])
+    try:
+        new_word = Word(**validate_word_row(data))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     db.session.add(new_word)
     db.session.commit()
+    today_word_cache.invalidate()
     return jsonify(new_word.to_dict()), 201
 
+WORD_BULK_BATCH_SIZE = int(os.getenv("WORD_BULK_BATCH_SIZE", 500))
+WORD_FIELD_LIMITS = {'title': 100, 'description': 500, 'example': 500}
+
+def validate_word_row(word_data) -> dict:
+    """Return a row ready for insertion, or raise ValueError describing what is wrong with it."""
+    if not isinstance(word_data, dict):
+        raise ValueError('Row must be an object')
+    row = {}
+    for field, max_length in WORD_FIELD_LIMITS.items():
+        value = word_data.get(field)
+        if not isinstance(value, str) or not value.strip():
+            raise ValueError(f'Missing {field}')
+        if len(value) > max_length:
+            raise ValueError(f'{field} is longer than {max_length} characters')
+        row[field] = value
+    published_date = word_data.get('published_date')
+    if not isinstance(published_date, str):
+        raise ValueError('Missing published_date')
+    try:
+        row['published_date'] = date.fromisoformat(published_date)
+    except ValueError:
+        raise ValueError('published_date must be YYYY-MM-DD')
+    return row
+
+def _iter_ndjson(stream) -> Iterator:
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield ValueError(f'Invalid JSON: {e}')
+
+def _copy_upsert_words(rows: List[dict]):
+    # PostgreSQL: COPY the batch into a session-local staging table, then upsert from it.
+    cursor = db.session.connection().connection.cursor()
+    try:
+        cursor.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS word_staging "
+            "(title varchar(100), description varchar(500), example varchar(500), published_date date) "
+            "ON COMMIT DELETE ROWS"
+        )
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([row['title'], row['description'], row['example'], row['published_date'].isoformat()])
+        buffer.seek(0)
+        cursor.copy_expert("COPY word_staging (title, description, example, published_date) FROM STDIN WITH (FORMAT csv)", buffer)
+        cursor.execute(
+            "INSERT INTO word (title, description, example, published_date) "
+            "SELECT title, description, example, published_date FROM word_staging "
+            "ON CONFLICT (published_date) DO UPDATE SET "
+            "title = EXCLUDED.title, description = EXCLUDED.description, example = EXCLUDED.example"
+        )
+    finally:
+        cursor.close()
+
+def upsert_words(rows: List[dict]):
+    """Insert a batch of validated rows, replacing any word already published on the same date."""
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        _copy_upsert_words(rows)
+        return
+    if dialect == 'sqlite':
+        stmt = sqlite_insert(Word).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Word.published_date],
+            set_={'title': stmt.excluded.title, 'description': stmt.excluded.description, 'example': stmt.excluded.example},
+        )
+        db.session.execute(stmt)
+        return
+    db.session.execute(insert(Word), rows)
+
 @app.route('/words/bulk', methods=['POST'])
+@require_admin
 def create_bulk_words():
-    words_data = request.get_json()
-    if not isinstance(words_data, list):
-        return jsonify({'error': 'Request body must be a list of words'}), 400
+    # NDJSON bodies are read line by line so an arbitrarily long calendar never sits in memory.
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        words_data = _iter_ndjson(request.stream)
+    else:
+        words_data = request.get_json(silent=True)
+        if not isinstance(words_data, list):
+            return jsonify({'error': 'Request body must be a list of words'}), 400
+
+    results = []
+    accepted = 0
+    seen_dates = set()
+    batch, batch_indexes = [], []
+
+    def flush():
+        nonlocal accepted
+        try:
+            upsert_words(batch)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            for index in batch_indexes:
+                results[index] = {'index': index, 'status': 'rejected', 'error': f'Database error: {e}'}
+            return
+        accepted += len(batch)
+
+    for index, word_data in enumerate(words_data):
+        try:
+            if isinstance(word_data, Exception):
+                raise word_data
+            row = validate_word_row(word_data)
+            if row['published_date'] in seen_dates:
+                raise ValueError('Duplicate published_date in upload')
+        except ValueError as e:
+            results.append({'index': index, 'status': 'rejected', 'error': str(e)})
+            continue
+        seen_dates.add(row['published_date'])
+        results.append({'index': index, 'status': 'accepted'})
+        batch.append(row)
+        batch_indexes.append(index)
+        if len(batch) >= WORD_BULK_BATCH_SIZE:
+            flush()
+            batch, batch_indexes = [], []
+    if batch:
+        flush()
+    if accepted:
+        today_word_cache.invalidate()
+
+    rejected = len(results) - accepted
+    if rejected:
+        message = f'Added {accepted} words, rejected {rejected}.'
+    else:
+        message = f'Successfully added {accepted} words.'
+    return jsonify({'message': message, 'accepted': accepted, 'rejected': rejected, 'results': results}), 200
+
+# Hard cap on page size regardless of what the client asks for.
+WORDS_PAGE_MAX = int(os.getenv("WORDS_PAGE_MAX", 500))
+WORD_COLUMNS = (Word.id, Word.title, Word.description, Word.example, Word.published_date)
+
+def serialize_word_row(row) -> dict:
+    # Same shape as Word.to_dict() once jsonify has rendered the date, built from a plain row.
+    return {'id': row.id, 'title': row.title, 'description': row.description, 'example': row.example,
+            'published_date': http_date(row.published_date)}
+
+def encode_cursor(published_date: date, direction: str) -> str:
+    raw = json.dumps({'d': published_date.isoformat(), 'dir': direction}).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(token: str):
     try:
-        print (words_data)
-        for word_data in words_data:
-            pub_date = datetime.strptime(word_data['published_date'], "%Y-%m-%d")
-            new_word = Word(title=word_data['title'], description=word_data['description'], example=word_data['example'], published_date=pub_date)
-            db.session.add(new_word)
-        db.session.commit()
-        return jsonify({'message': f'Successfully added {len(words_data)} words.'}), 200
-    except Exception as e:
-        print (e)
-        db.session.rollback()
-        return jsonify({'error': f'An error occurred: {e}'}), 500
+        data = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+        direction = data['dir']
+        if direction not in ('next', 'prev'):
+            raise ValueError
+        return date.fromisoformat(data['d']), direction
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+def _parse_date_arg(name: str) -> Optional[date]:
+    value = request.args.get(name)
+    if value is None:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f'{name} must be YYYY-MM-DD')
 
 @app.route('/words/', methods=['GET'])
 def get_words():
-    skip = request.args.get('skip', 0, type=int)
-    limit = request.args.get('limit', 100, type=int)
-    words = Word.query.offset(skip).limit(limit).all()
-    return jsonify([word.to_dict() for word in words])
+    """Words ordered by published_date, paginated with opaque cursors.
+
+    The body stays a plain list; the cursors for the neighbouring pages are returned in
+    the X-Next-Cursor / X-Prev-Cursor headers and as a Link header. ``skip`` is still
+    accepted for older clients but costs a scan of the skipped rows.
+    """
+    limit = min(max(request.args.get('limit', 100, type=int), 1), WORDS_PAGE_MAX)
+    skip = max(request.args.get('skip', 0, type=int), 0)
+    try:
+        date_from = _parse_date_arg('from')
+        date_to = _parse_date_arg('to')
+        cursor = request.args.get('cursor')
+        cursor_date, direction = decode_cursor(cursor) if cursor else (None, None)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    stmt = select(*WORD_COLUMNS)
+    if date_from is not None:
+        stmt = stmt.where(Word.published_date >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(Word.published_date <= date_to)
+    if direction == 'next':
+        stmt = stmt.where(Word.published_date > cursor_date).order_by(Word.published_date)
+    elif direction == 'prev':
+        stmt = stmt.where(Word.published_date < cursor_date).order_by(Word.published_date.desc())
+    else:
+        stmt = stmt.order_by(Word.published_date).offset(skip)
+    rows = db.session.execute(stmt.limit(limit + 1)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if direction == 'prev':
+        rows.reverse()
+
+    response = jsonify([serialize_word_row(row) for row in rows])
+    if not rows:
+        return response
+    links = []
+    filters = {key: request.args[key] for key in ('from', 'to') if key in request.args}
+    if has_more or direction == 'prev':
+        next_cursor = encode_cursor(rows[-1].published_date, 'next')
+        response.headers['X-Next-Cursor'] = next_cursor
+        links.append(f'<{url_for("get_words", cursor=next_cursor, limit=limit, **filters)}>; rel="next"')
+    if direction == 'next' or (direction == 'prev' and has_more) or (direction is None and skip > 0):
+        prev_cursor = encode_cursor(rows[0].published_date, 'prev')
+        response.headers['X-Prev-Cursor'] = prev_cursor
+        links.append(f'<{url_for("get_words", cursor=prev_cursor, limit=limit, **filters)}>; rel="prev"')
+    if links:
+        response.headers['Link'] = ', '.join(links)
+    return response
+
+# /words/today is cached per worker. Writes in this worker invalidate it immediately; other
+# workers pick up changes within TODAY_CACHE_TTL seconds.
+TODAY_CACHE_TTL = int(os.getenv("TODAY_CACHE_TTL", 60))
+TODAY_CACHE_MAX_AGE = int(os.getenv("TODAY_CACHE_MAX_AGE", 300))
+
+class CachedResponse:
+    def __init__(self, key, status: int, body: bytes):
+        self.key = key
+        self.status = status
+        self.body = body
+        self.etag = hashlib.sha1(body).hexdigest()
+        self.expires = 0.0
+
+class ResponseCache:
+    """Single-entry cache that lets only one thread at a time rebuild a missing entry."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.entry = None
+        self.generation = 0
+        self.lock = threading.Lock()
+
+    def get(self, key, loader: Callable[[], CachedResponse]) -> CachedResponse:
+        entry = self.entry
+        if entry is not None and entry.key == key and entry.expires > time.monotonic():
+            return entry
+        with self.lock:
+            # Another thread may have filled the entry while this one waited for the lock.
+            entry = self.entry
+            if entry is not None and entry.key == key and entry.expires > time.monotonic():
+                return entry
+            generation = self.generation
+            entry = loader()
+            entry.expires = time.monotonic() + self.ttl
+            if generation == self.generation:
+                self.entry = entry
+            return entry
+
+    def invalidate(self):
+        self.generation += 1
+        self.entry = None
+
+today_word_cache = ResponseCache(TODAY_CACHE_TTL)
+
+def _load_today_word(today: date) -> CachedResponse:
+    row = db.session.execute(
+        select(*WORD_COLUMNS).where(Word.published_date <= today).order_by(Word.published_date.desc()).limit(1)
+    ).first()
+    if row is None:
+        return CachedResponse(today, 404, app.json.dumps({'error': 'Word of the day not found'}).encode())
+    return CachedResponse(today, 200, app.json.dumps(serialize_word_row(row)).encode())
 
 @app.route('/words/today', methods=['GET'])
 def get_today_word():
-    word = Word.query.order_by(Word.published_date.desc()).first()
-    if not word:
-        return jsonify({'error': 'Word of the day not found'}), 404
-    return jsonify(word.to_dict())
+    now = datetime.now(APP_TIMEZONE)
+    today = now.date()
+    entry = today_word_cache.get(today, lambda: _load_today_word(today))
+    response = app.response_class(entry.body, status=entry.status, mimetype='application/json')
+    if entry.status != 200:
+        return response
+    # The answer can change at local midnight, so never let clients cache past it.
+    midnight = APP_TIMEZONE.localize(datetime.combine(today + timedelta(days=1), datetime.min.time()))
+    response.cache_control.public = True
+    response.cache_control.max_age = max(min(TODAY_CACHE_MAX_AGE, int((midnight - now).total_seconds())), 0)
+    # Only a content ETag: the word for a date can be rewritten by /words/bulk, so no
+    # timestamp we have says when the response last changed.
+    response.set_etag(entry.etag)
+    return response.make_conditional(request)
+
+# Full-text search over title, description and example. SQLite uses an FTS5 table kept in
+# sync with `word` by triggers; PostgreSQL uses a GIN index on a weighted tsvector
+# expression, which the database maintains on every insert, update and COPY upsert.
+SEARCH_MAX_RESULTS = int(os.getenv("SEARCH_MAX_RESULTS", 100))
+SEARCH_MAX_TERMS = 10
+# Tokens are not stemmed: every query term is a prefix, and a stemmed index misses partial
+# input such as "immuta" (stored as "immut").
+WORD_SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', title), 'A') || "
+    "setweight(to_tsvector('simple', description), 'B') || "
+    "setweight(to_tsvector('simple', example), 'C')"
+)
+SQLITE_SEARCH_SETUP = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS word_fts USING fts5("
+    "title, description, example, content='word', content_rowid='id', tokenize='unicode61', prefix='2 3 4')",
+    "CREATE TRIGGER IF NOT EXISTS word_fts_insert AFTER INSERT ON word BEGIN "
+    "INSERT INTO word_fts(rowid, title, description, example) VALUES (new.id, new.title, new.description, new.example); END",
+    "CREATE TRIGGER IF NOT EXISTS word_fts_delete AFTER DELETE ON word BEGIN "
+    "INSERT INTO word_fts(word_fts, rowid, title, description, example) VALUES ('delete', old.id, old.title, old.description, old.example); END",
+    "CREATE TRIGGER IF NOT EXISTS word_fts_update AFTER UPDATE ON word BEGIN "
+    "INSERT INTO word_fts(word_fts, rowid, title, description, example) VALUES ('delete', old.id, old.title, old.description, old.example); "
+    "INSERT INTO word_fts(rowid, title, description, example) VALUES (new.id, new.title, new.description, new.example); END",
+]
+
+def ensure_search_index():
+    """Create the full-text index for the current database if it does not exist yet."""
+    with app.app_context():
+        dialect = db.engine.dialect.name
+        with db.engine.begin() as connection:
+            if dialect == 'sqlite':
+                exists = connection.exec_driver_sql("SELECT 1 FROM sqlite_master WHERE name = 'word_fts'").first()
+                for statement in SQLITE_SEARCH_SETUP:
+                    connection.exec_driver_sql(statement)
+                if not exists:
+                    # Index the words that were there before the triggers.
+                    connection.exec_driver_sql("INSERT INTO word_fts(word_fts) VALUES ('rebuild')")
+            elif dialect == 'postgresql':
+                connection.exec_driver_sql(f"CREATE INDEX IF NOT EXISTS word_search_idx ON word USING GIN (({WORD_SEARCH_VECTOR}))")
+
+@app.route('/words/search', methods=['GET'])
+def search_words():
+    """Ranked matches for ``q``; every term is a prefix, so partial input works for type-ahead."""
+    terms = re.findall(r'\w+', request.args.get('q', '').lower())[:SEARCH_MAX_TERMS]
+    if not terms:
+        return jsonify({'error': 'Missing search query'}), 400
+    limit = min(max(request.args.get('limit', 20, type=int), 1), SEARCH_MAX_RESULTS)
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite':
+        stmt = text(
+            "SELECT word.id, word.title, word.description, word.example, word.published_date "
+            "FROM word_fts JOIN word ON word.id = word_fts.rowid "
+            "WHERE word_fts MATCH :query ORDER BY bm25(word_fts, 10.0, 4.0, 1.0) LIMIT :limit"
+        ).columns(*WORD_COLUMNS)
+        query = ' '.join(f'"{term}"*' for term in terms)
+    elif dialect == 'postgresql':
+        stmt = text(
+            "SELECT id, title, description, example, published_date FROM word "
+            f"WHERE ({WORD_SEARCH_VECTOR}) @@ to_tsquery('simple', :query) "
+            f"ORDER BY ts_rank(({WORD_SEARCH_VECTOR}), to_tsquery('simple', :query)) DESC LIMIT :limit"
+        ).columns(*WORD_COLUMNS)
+        query = ' & '.join(f'{term}:*' for term in terms)
+    else:
+        return jsonify({'error': f'Search is not supported on {dialect}'}), 501
+    rows = db.session.execute(stmt, {'query': query, 'limit': limit}).all()
+    return jsonify([serialize_word_row(row) for row in rows])
+
+# The subscriber count is read from a counter row maintained alongside every signup,
+# and cached for USER_COUNT_CACHE_TTL seconds on top of that.
+USER_COUNT_CACHE_TTL = int(os.getenv("USER_COUNT_CACHE_TTL", 5))
+USER_COUNTER = 'users'
+user_count_cache = ResponseCache(USER_COUNT_CACHE_TTL)
+
+def increment_counter(name: str, amount: int = 1):
+    """Adjust a counter inside the caller's transaction."""
+    db.session.execute(update(Counter).where(Counter.name == name).values(value=Counter.value + amount))
+
+def set_counter(name: str, value: int):
+    """Create or overwrite a counter row; safe when several processes do it at once."""
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        stmt = postgresql_insert(Counter).values(name=name, value=value)
+    elif dialect == 'sqlite':
+        stmt = sqlite_insert(Counter).values(name=name, value=value)
+    else:
+        db.session.merge(Counter(name=name, value=value))
+        return
+    db.session.execute(stmt.on_conflict_do_update(index_elements=[Counter.name], set_={'value': stmt.excluded.value}))
+
+def reconcile_user_count() -> int:
+    """Recompute the exact subscriber count and store it in the counter row."""
+    count = db.session.query(func.count(User.id)).scalar()
+    set_counter(USER_COUNTER, count)
+    db.session.commit()
+    user_count_cache.invalidate()
+    return count
+
+def _load_user_count() -> CachedResponse:
+    count = db.session.execute(select(Counter.value).where(Counter.name == USER_COUNTER)).scalar()
+    if count is None:
+        # First read after deploy: seed the counter from the table.
+        count = reconcile_user_count()
+    return CachedResponse(USER_COUNTER, 200, app.json.dumps({'count': count}).encode())
 
 @app.route('/users/count', methods=['GET'])
 def get_users_count():
-    count = db.session.query(func.count(User.id)).scalar()
-    return jsonify({'count': count})
+    entry = user_count_cache.get(USER_COUNTER, _load_user_count)
+    return app.response_class(entry.body, status=entry.status, mimetype='application/json')
+
+@app.route('/admin/users/count/reconcile', methods=['POST'])
+@require_admin
+def reconcile_users_count():
+    return jsonify({'count': reconcile_user_count()})
+
+
+# Admin exports stream straight from the database: rows are read in EXPORT_CHUNK_SIZE
+# batches (a server-side cursor on PostgreSQL) and written out as they arrive.
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", 1000))
+EXPORT_FLUSH_BYTES = 64 * 1024
+EXPORTS = {
+    'words': (Word, ('id', 'title', 'description', 'example', 'published_date')),
+    'users': (User, ('id', 'name', 'email', 'joined_date', 'timezone', 'send_hour')),
+}
+
+def _export_value(value):
+    return value.isoformat() if isinstance(value, (date, datetime)) else value
+
+def _iter_export_lines(model, fields, fmt: str) -> Iterator[str]:
+    columns = [getattr(model, field) for field in fields]
+    if fmt == 'csv':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        for row in stream_rows(model, columns, chunk_size=EXPORT_CHUNK_SIZE):
+            writer.writerow([_export_value(getattr(row, field)) for field in fields])
+            if buffer.tell() >= EXPORT_FLUSH_BYTES:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+        return
+    lines = []
+    size = 0
+    for row in stream_rows(model, columns, chunk_size=EXPORT_CHUNK_SIZE):
+        line = json.dumps({field: _export_value(getattr(row, field)) for field in fields}) + '\n'
+        lines.append(line)
+        size += len(line)
+        if size >= EXPORT_FLUSH_BYTES:
+            yield ''.join(lines)
+            lines, size = [], 0
+    yield ''.join(lines)
+
+def _gzip_stream(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        # Sync-flush so each chunk reaches the client now instead of sitting in the compressor.
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+@app.route('/admin/export/<table>', methods=['GET'])
+@require_admin
+def export_table(table):
+    """Stream the words or users table as NDJSON (default) or CSV, optionally gzip-encoded."""
+    if table not in EXPORTS:
+        return jsonify({'error': f'Unknown export: {table}'}), 404
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in ('ndjson', 'csv'):
+        return jsonify({'error': 'format must be ndjson or csv'}), 400
+    model, fields = EXPORTS[table]
+    # An empty first chunk makes the server send the headers before the first query runs.
+    chunks = itertools.chain([b''], (lines.encode('utf-8') for lines in _iter_export_lines(model, fields, fmt)))
+    use_gzip = request.args.get('gzip', '').lower() in ('1', 'true', 'yes')
+    if use_gzip:
+        chunks = _gzip_stream(chunks)
+    response = app.response_class(stream_with_context(chunks),
+                                  mimetype='text/csv' if fmt == 'csv' else 'application/x-ndjson')
+    response.headers['Content-Disposition'] = f'attachment; filename={table}.{fmt}'
+    if use_gzip:
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
 
 
 # --- 6. Helper Functions & Scheduled Job ---
@@ -380,91 +1398,752 @@ SMTP_PORT = int(os.getenv("SMTP_PORT", 2525))
 SMTP_USERNAME = os.getenv("SMTP_USERNAME")
 SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
 SENDER_EMAIL = os.getenv("SENDER_EMAIL")
+# Delivery engine tuning: number of parallel SMTP connections, how many messages each
+# connection sends before it is recycled, a global messages/sec cap (0 = unlimited) and
+# how many times a message is retried on a fresh connection before it is counted as failed.
+SMTP_WORKERS = int(os.getenv("SMTP_WORKERS", 4))
+SMTP_MAX_MESSAGES_PER_CONNECTION = int(os.getenv("SMTP_MAX_MESSAGES_PER_CONNECTION", 100))
+SMTP_RATE_LIMIT = float(os.getenv("SMTP_RATE_LIMIT", 0))
+SMTP_MAX_RECONNECTS = int(os.getenv("SMTP_MAX_RECONNECTS", 3))
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", 30))
+# Local relays and test sinks often speak plain SMTP only.
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "true").lower() in ('1', 'true', 'yes')
+# Base delay in seconds before retrying a transient SMTP error; doubles on every attempt.
+SMTP_RETRY_BACKOFF = float(os.getenv("SMTP_RETRY_BACKOFF", 1))
+# The job stops after this many connection attempts in a row fail, rather than hammering a
+# relay that is down or refusing us.
+SMTP_MAX_CONNECT_FAILURES = int(os.getenv("SMTP_MAX_CONNECT_FAILURES", 10))
 
-def send_email_to_recipients(subject: str, content: dict, recipients: List[str]):
-    if not all([SMTP_SERVER, SMTP_PORT, SMTP_USERNAME, SMTP_PASSWORD, SENDER_EMAIL]):
-        print("SMTP environment variables not configured. Skipping email job.")
-        return
+class RateLimiter:
+    """Token bucket shared by all SMTP worker threads."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.capacity = max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+class DeliveryStats:
+    """Thread-safe counters for a single email job, with an optional per-recipient callback."""
+
+    def __init__(self, on_result: Optional[Callable[[List[str], bool, Optional[str], bool], None]] = None):
+        self.on_result = on_result
+        self.sent = 0
+        self.failed = 0
+        self.started = time.monotonic()
+        self.finished = None
+        self.abort_reason = None
+        self.connect_failures = 0
+        self.lock = threading.Lock()
+
+    @property
+    def aborted(self) -> bool:
+        return self.abort_reason is not None
+
+    def abort(self, reason: str):
+        """Stop the whole job; recipients not yet handed to the relay are left untried."""
+        with self.lock:
+            if self.abort_reason is not None:
+                return
+            self.abort_reason = reason
+        print(f"Email job aborted: {reason}")
+
+    def connection_opened(self):
+        with self.lock:
+            self.connect_failures = 0
+
+    def connection_failed(self, exc: Exception):
+        with self.lock:
+            self.connect_failures += 1
+            failures = self.connect_failures
+        if failures >= SMTP_MAX_CONNECT_FAILURES:
+            self.abort(f"{failures} connection attempts in a row failed, the last with: {exc}")
+
+    def record(self, recipients: List[str], ok: bool, error: Optional[str] = None, permanent: bool = False):
+        if not recipients:
+            return
+        with self.lock:
+            if ok:
+                self.sent += len(recipients)
+            else:
+                self.failed += len(recipients)
+        EMAIL_RECIPIENTS.labels('sent' if ok else 'failed').inc(len(recipients))
+        if self.on_result is not None:
+            self.on_result(recipients, ok, error, permanent)
 
-    print(f"Starting email job to send to {len(recipients)} recipients...")
-    html_body = f"""
+    def finish(self):
+        self.finished = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def rate(self) -> float:
+        return self.sent / self.elapsed if self.elapsed > 0 else 0.0
+
+EMAIL_HTML_TEMPLATE = string.Template("""
     <html>
       <head></head>
       <body style="font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif; line-height: 1.6; color: #333;">
         <div style="max-width: 600px; margin: 20px auto; padding: 20px; border: 1px solid #e0e0e0; border-radius: 8px; background-color: #f9f9f9;">
           <h1 style="font-size: 24px; color: #1a1a1a; border-bottom: 2px solid #eee; padding-bottom: 10px;">Word of the Day</h1>
-          <h2 style="font-size: 28px; color: #0056b3; margin-top: 20px;">{content['title']}</h2>
+          <h2 style="font-size: 28px; color: #0056b3; margin-top: 20px;">$title</h2>
           <h3 style="font-size: 16px; color: #333; margin-top: 25px; border-bottom: 1px solid #eee; padding-bottom: 5px;">DESCRIPTION</h3>
-          <p style="font-size: 16px;">{content['description']}</p>
+          <p style="font-size: 16px;">$description</p>
           <h3 style="font-size: 16px; color: #333; margin-top: 25px; border-bottom: 1px solid #eee; padding-bottom: 5px;">EXAMPLE</h3>
           <blockquote style="border-left: 4px solid #0056b3; padding-left: 15px; margin-left: 0; font-style: italic; color: #555;">
-            {content['example']}
+            $example
           </blockquote>
           <hr style="border: none; border-top: 1px solid #eee; margin-top: 30px;">
           <p style="color: #888; font-size: 12px; text-align: center;">Have a great day!</p>
         </div>
       </body>
     </html>
-    """
+    """)
+EMAIL_TEXT_TEMPLATE = string.Template("Word of the Day: $title\nDescription: $description\nExample: $example\n")
+# When > 0, one message is sent per chunk of this many recipients, addressed to the sender
+# with the subscribers only on the envelope (BCC). 0 sends one message per recipient.
+SMTP_BCC_BATCH_SIZE = int(os.getenv("SMTP_BCC_BATCH_SIZE", 0))
+
+def render_daily_email(subject: str, content: dict) -> bytes:
+    """Render and MIME-encode the daily email once; only the To header varies per send."""
+    from email.message import EmailMessage
+    import email.policy
+    fields = {key: content[key] for key in ('title', 'description', 'example')}
+    msg = EmailMessage()
+    msg['Subject'] = subject
+    msg['From'] = SENDER_EMAIL
+    # Create a plain-text fallback
+    msg.set_content(EMAIL_TEXT_TEMPLATE.substitute(fields))
+    msg.add_alternative(EMAIL_HTML_TEMPLATE.substitute({key: html.escape(value) for key, value in fields.items()}), subtype='html')
+    return msg.as_bytes(policy=email.policy.SMTP)
+
+def address_payload(payload: bytes, to: str) -> bytes:
+    # Header values must not smuggle in extra headers.
+    to = to.replace('\r', '').replace('\n', '')
+    return b'To: ' + to.encode('utf-8') + b'\r\n' + payload
+
+def open_smtp_connection() -> "smtplib.SMTP":
+    import smtplib
+    server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT, timeout=SMTP_TIMEOUT)
     try:
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
+        if SMTP_STARTTLS:
             server.starttls()
-            server.login(SMTP_USERNAME, SMTP_PASSWORD)
-            for recipient in recipients:
-                msg = EmailMessage()
-                msg['Subject'] = subject
-                msg['From'] = SENDER_EMAIL
-                msg['To'] = recipient
-                # Create a plain-text fallback
-                plain_text_body = f"Word of the Day: {content['title']}\\nDescription: {content['description']}\\nExample: {content['example']}"
-                msg.set_content(plain_text_body)
-                msg.add_alternative(html_body, subtype='html')
-                server.send_message(msg)
-                print(f"Email sent to {recipient}")
-        print("Email job finished successfully.")
-    except Exception as e:
-        print(f"An error occurred while sending emails: {e}")
-
-def send_daily_word_job():
+        server.login(SMTP_USERNAME, SMTP_PASSWORD)
+    except Exception:
+        close_smtp_connection(server)
+        raise
+    return server
+
+def close_smtp_connection(server):
+    if server is None:
+        return
+    try:
+        server.quit()
+    except Exception:
+        server.close()
+
+def is_transient_smtp_error(exc: Exception) -> bool:
+    import smtplib
+    # 4xx replies and dropped connections are worth retrying; 5xx replies are final.
+    if isinstance(exc, smtplib.SMTPConnectError):
+        return True
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return 400 <= exc.smtp_code < 500
+    return isinstance(exc, (smtplib.SMTPServerDisconnected, OSError))
+
+def is_fatal_smtp_error(exc: Exception) -> bool:
+    """Errors that would fail every message of the job alike: bad credentials, a refused sender,
+    a relay that rejects the session or the message itself."""
+    import smtplib
+    if isinstance(exc, (smtplib.SMTPAuthenticationError, smtplib.SMTPSenderRefused, smtplib.SMTPHeloError,
+                        smtplib.SMTPNotSupportedError)):
+        return True
+    return isinstance(exc, (smtplib.SMTPConnectError, smtplib.SMTPDataError)) and exc.smtp_code >= 500
+
+def _smtp_worker(work: queue.Queue, payload: bytes, limiter: RateLimiter, stats: DeliveryStats):
+    # Each worker owns one SMTP session and recycles it after SMTP_MAX_MESSAGES_PER_CONNECTION
+    # messages or whenever the relay drops it. Work items are lists of recipients: a single
+    # address in per-recipient mode, or a whole BCC chunk.
+    import smtplib
+    server = None
+    sent_on_connection = 0
+    try:
+        while True:
+            chunk = work.get()
+            if chunk is None:
+                return
+            if stats.aborted:
+                # Drain without sending; recording nothing leaves these recipients untried.
+                continue
+            if len(chunk) == 1:
+                message = address_payload(payload, chunk[0])
+            else:
+                message = address_payload(payload, SENDER_EMAIL)
+            refused, error = {}, None
+            for attempt in range(SMTP_MAX_RECONNECTS + 1):
+                try:
+                    if server is None or sent_on_connection >= SMTP_MAX_MESSAGES_PER_CONNECTION:
+                        close_smtp_connection(server)
+                        server = None
+                        try:
+                            server = open_smtp_connection()
+                        except Exception as e:
+                            stats.connection_failed(e)
+                            raise
+                        stats.connection_opened()
+                        sent_on_connection = 0
+                    limiter.acquire()
+                    with EMAIL_SEND_LATENCY.time():
+                        refused, error = server.sendmail(SENDER_EMAIL, chunk, message), None
+                    sent_on_connection += 1
+                    break
+                except smtplib.SMTPRecipientsRefused as e:
+                    # Permanent rejection for every address; the connection is still usable.
+                    refused, error = e.recipients, None
+                    break
+                except Exception as e:
+                    error = e
+                    close_smtp_connection(server)
+                    server = None
+                    if is_fatal_smtp_error(e):
+                        stats.abort(f"{type(e).__name__}: {e}")
+                    if stats.aborted or attempt == SMTP_MAX_RECONNECTS or not is_transient_smtp_error(e):
+                        break
+                    time.sleep(min(SMTP_RETRY_BACKOFF * 2 ** attempt, 60))
+            if error is not None and stats.aborted:
+                continue
+            if error is not None:
+                print(f"Failed to send email to {', '.join(chunk)}: {error}")
+                # Retried on a later run: only a per-address RCPT refusal says the address itself is bad.
+                stats.record(chunk, False, str(error))
+                continue
+            if refused:
+                print(f"Recipients refused: {', '.join(refused)}")
+                # Per-address replies: 4xx (e.g. mailbox busy) is worth another try, 5xx is final.
+                for permanent in (True, False):
+                    addresses = [address for address, (code, _) in refused.items() if (code >= 500) == permanent]
+                    stats.record(addresses, False, 'refused', permanent=permanent)
+            stats.record([recipient for recipient in chunk if recipient not in refused], True)
+    finally:
+        close_smtp_connection(server)
+
+def send_email_to_recipients(subject: str, content: dict, recipients: Iterable[str],
+                             on_result: Optional[Callable[[List[str], bool, Optional[str], bool], None]] = None) -> Optional[DeliveryStats]:
+    if not all([SMTP_SERVER, SMTP_PORT, SMTP_USERNAME, SMTP_PASSWORD, SENDER_EMAIL]):
+        print("SMTP environment variables not configured. Skipping email job.")
+        return None
+
+    print(f"Starting email job with {max(SMTP_WORKERS, 1)} SMTP connections...")
+    payload = render_daily_email(subject, content)
+    stats = DeliveryStats(on_result)
+    limiter = RateLimiter(SMTP_RATE_LIMIT)
+    worker_count = max(SMTP_WORKERS, 1)
+    chunk_size = max(SMTP_BCC_BATCH_SIZE, 1)
+    # Bounded so a large recipient list is handed to the workers as they drain it
+    # rather than being copied into the queue up front.
+    work = queue.Queue(maxsize=worker_count * 100)
+    workers = [
+        threading.Thread(target=_smtp_worker, args=(work, payload, limiter, stats), daemon=True)
+        for _ in range(worker_count)
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        chunk = []
+        for recipient in recipients:
+            if stats.aborted:
+                chunk = []
+                break
+            chunk.append(recipient)
+            if len(chunk) >= chunk_size:
+                work.put(chunk)
+                chunk = []
+        if chunk:
+            work.put(chunk)
+    finally:
+        for _ in workers:
+            work.put(None)
+        for worker in workers:
+            worker.join()
+        stats.finish()
+    EMAIL_JOB_RATE.set(stats.rate)
+    if stats.aborted:
+        print(f"Email job stopped early: {stats.sent} sent, {stats.failed} failed; the remaining recipients were not tried.")
+        return stats
+    print(f"Email job finished: {stats.sent} sent, {stats.failed} failed in {stats.elapsed:.2f}s ({stats.rate:.1f} msgs/sec).")
+    return stats
+
+RECIPIENT_CHUNK_SIZE = int(os.getenv("RECIPIENT_CHUNK_SIZE", 1000))
+# Per-recipient outcomes are buffered and written in batches of this size.
+DELIVERY_LOG_BATCH_SIZE = int(os.getenv("DELIVERY_LOG_BATCH_SIZE", 500))
+# A run whose checkpoints are older than this is treated as abandoned and resumed.
+DELIVERY_STALE_MINUTES = int(os.getenv("DELIVERY_STALE_MINUTES", 10))
+DELIVERY_RETRY_MINUTES = int(os.getenv("DELIVERY_RETRY_MINUTES", 15))
+# Transient failures are retried until an address has been tried this many times in a run.
+DELIVERY_MAX_ATTEMPTS = int(os.getenv("DELIVERY_MAX_ATTEMPTS", 5))
+# How many hours late a bucket may still be sent, e.g. after downtime or a missed tick.
+DELIVERY_CATCHUP_HOURS = int(os.getenv("DELIVERY_CATCHUP_HOURS", 2))
+
+# Keeps the scheduled job and the retry job from running the same delivery concurrently in one process.
+_delivery_lock = threading.Lock()
+
+def upsert_deliveries(rows: List[dict]):
+    """Record delivery outcomes; a retried recipient updates its earlier row and attempt count."""
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        stmt = postgresql_insert(Delivery).values(rows)
+    elif dialect == 'sqlite':
+        stmt = sqlite_insert(Delivery).values(rows)
+    else:
+        db.session.execute(insert(Delivery), rows)
+        return
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Delivery.run_id, Delivery.email],
+        set_={'status': stmt.excluded.status, 'error': stmt.excluded.error, 'updated_at': stmt.excluded.updated_at,
+              'attempts': Delivery.attempts + 1},
+    )
+    db.session.execute(stmt)
+
+class DeliveryLog:
+    """Buffers per-recipient outcomes of a delivery run and checkpoints them in batches."""
+
+    def __init__(self, run_id: int, batch_size: int = DELIVERY_LOG_BATCH_SIZE):
+        self.run_id = run_id
+        self.batch_size = batch_size
+        self.pending = []
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+
+    def record(self, recipients: List[str], ok: bool, error: Optional[str] = None, permanent: bool = False):
+        now = datetime.utcnow()
+        status = 'sent' if ok else 'rejected' if permanent else 'failed'
+        if error is not None:
+            error = error[:255]
+        with self.lock:
+            self.pending.extend(
+                {'run_id': self.run_id, 'email': recipient, 'status': status, 'error': error, 'updated_at': now}
+                for recipient in recipients
+            )
+            if len(self.pending) < self.batch_size:
+                return
+            batch, self.pending = self.pending, []
+        self._write(batch)
+
+    def flush(self):
+        with self.lock:
+            batch, self.pending = self.pending, []
+        if batch:
+            self._write(batch)
+
+    def _write(self, batch: List[dict]):
+        # Called from SMTP worker threads, which need their own app context and session.
+        with self.write_lock, app.app_context():
+            try:
+                upsert_deliveries(batch)
+                db.session.execute(update(DeliveryRun).where(DeliveryRun.id == self.run_id).values(updated_at=datetime.utcnow()))
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                print(f"Could not checkpoint {len(batch)} deliveries for run {self.run_id}: {e}")
+
+def stream_rows(model, columns, where=True, chunk_size: int = RECIPIENT_CHUNK_SIZE) -> Iterator:
+    """Yield rows of ``columns`` in primary-key order without materializing the whole table."""
+    if db.engine.dialect.name == 'postgresql':
+        # Server-side cursor: rows stream in as psycopg2 fetches each batch.
+        yield from db.session.execute(
+            select(*columns).where(where).order_by(model.id).execution_options(stream_results=True, yield_per=chunk_size)
+        )
+        return
+    # Keyset pagination on the primary key so every chunk is an index range scan.
+    last_id = 0
+    while True:
+        rows = db.session.execute(
+            select(*columns, model.id.label('keyset_id')).where(model.id > last_id, where).order_by(model.id).limit(chunk_size)
+        ).all()
+        if not rows:
+            return
+        yield from rows
+        last_id = rows[-1].keyset_id
+
+def _not_yet_sent(run_id: Optional[int]):
+    if run_id is None:
+        return True
+    # Only transient failures that are still under the attempt cap are tried again.
+    done = or_(Delivery.status != 'failed', Delivery.attempts >= DELIVERY_MAX_ATTEMPTS)
+    return ~select(Delivery.id).where(Delivery.run_id == run_id, Delivery.email == User.email, done).exists()
+
+def iter_recipient_emails(buckets: List[Tuple[str, int]], chunk_size: int = RECIPIENT_CHUNK_SIZE,
+                          exclude_run_id: Optional[int] = None) -> Iterator[str]:
+    """Yield emails of the subscribers in the given (timezone, send_hour) buckets, one bucket at a time.
+
+    Each bucket is a range of the (timezone, send_hour, id) index. With ``exclude_run_id`` set,
+    addresses that run has already sent, rejected or given up on are skipped.
+    """
+    pending = _not_yet_sent(exclude_run_id)
+    for timezone_name, send_hour in buckets:
+        in_bucket = and_(User.timezone == timezone_name, User.send_hour == send_hour, pending)
+        for row in stream_rows(User, (User.email,), in_bucket, chunk_size):
+            yield row.email
+
+def due_buckets(now: datetime) -> Dict[date, List[Tuple[str, int]]]:
+    """Buckets whose local send time has passed (within the catch-up window), grouped by local date."""
+    due = {}
+    for timezone_name in db.session.execute(select(User.timezone).distinct()).scalars():
+        try:
+            local = now.astimezone(pytz.timezone(timezone_name))
+        except pytz.UnknownTimeZoneError:
+            print(f"Skipping subscribers with unknown timezone {timezone_name}.")
+            continue
+        # Local wall-clock time shifted so its hour is the most recent slot that has come.
+        latest = local.replace(tzinfo=None) - timedelta(minutes=DELIVERY_MINUTE)
+        for hours_late in range(DELIVERY_CATCHUP_HOURS + 1):
+            # Each slot belongs to its own local date, so a missed 23:00 is still sent after midnight.
+            slot = latest - timedelta(hours=hours_late)
+            buckets = due.setdefault(slot.date(), [])
+            if (timezone_name, slot.hour) not in buckets:
+                buckets.append((timezone_name, slot.hour))
+    return due
+
+def _start_delivery_run(run: Optional[DeliveryRun], local_date: date, word: Word,
+                        buckets: List[Tuple[str, int]]) -> Optional[DeliveryRun]:
+    if run is None:
+        run = DeliveryRun(run_date=local_date, word_id=word.id, buckets=json.dumps(sorted(buckets)))
+        db.session.add(run)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            print(f"Skipping {local_date}: another process started its delivery run.")
+            return None
+        return run
+    # Continuing: a later bucket, or a resume after failures or a crash. Recipients already
+    # sent are skipped and failed ones are retried.
+    known = {tuple(bucket) for bucket in json.loads(run.buckets)}
+    run.buckets = json.dumps(sorted(known.union(buckets)))
+    run.status = 'running'
+    run.attempts += 1
+    run.updated_at = datetime.utcnow()
+    db.session.commit()
+    return run
+
+def _finish_delivery_run(run: DeliveryRun, interrupted: bool = False):
+    counts = dict(
+        db.session.query(Delivery.status, func.count(Delivery.id)).filter(Delivery.run_id == run.id).group_by(Delivery.status).all()
+    )
+    retryable = db.session.query(func.count(Delivery.id)).filter(
+        Delivery.run_id == run.id, Delivery.status == 'failed', Delivery.attempts < DELIVERY_MAX_ATTEMPTS
+    ).scalar()
+    run.sent_count = counts.get('sent', 0)
+    run.failed_count = counts.get('failed', 0) + counts.get('rejected', 0)
+    # Rejected addresses and ones out of attempts will not be retried, so they do not keep a run open;
+    # an interrupted job (e.g. the relay refused our login) left recipients untried, which do.
+    run.status = 'incomplete' if retryable or interrupted else 'completed'
+    run.updated_at = run.finished_at = datetime.utcnow()
+    db.session.commit()
+    print(f"Delivery run {run.id} {run.status}: {run.sent_count} sent, {run.failed_count} failed.")
+
+def send_daily_word_job(now: Optional[datetime] = None):
+    """Send each local date's word to every subscriber bucket whose send time has come.
+
+    Runs hourly; ``now`` (timezone-aware) defaults to the current time.
+    """
+    if not _delivery_lock.acquire(blocking=False):
+        print("Job skipped: a delivery is already running in this process.")
+        return
+    try:
+        _send_due_words(now or datetime.now(pytz.utc))
+    finally:
+        _delivery_lock.release()
+
+def _send_due_words(now: datetime):
     # app_context is needed to access the database outside of a request
     with app.app_context():
-        print(f"Running scheduled job at {datetime.now(pytz.timezone('US/Eastern'))}")
-        today = datetime.now(pytz.timezone('US/Eastern')).date()
-        word_of_day = db.session.query(Word).filter(Word.published_date == today).first()
-        # word_of_day = Word.query(Word.).order_by(Word.published_date.desc()).first()
-        # word_of_day = Word.query.order_by(Word.published_date.desc()).first()
-        if not word_of_day:
-            print("Job aborted: No word of the day found.")
-            return
+        print(f"Running scheduled job at {now.astimezone(APP_TIMEZONE)}")
+        for local_date, buckets in sorted(due_buckets(now).items()):
+            _send_word_for_date(local_date, buckets)
 
-        users = User.query.all()
-        recipient_emails = [user.email for user in users]
-        if not recipient_emails:
-            print("Job aborted: No users to email.")
-            return
+def _send_word_for_date(local_date: date, buckets: List[Tuple[str, int]]):
+    run = DeliveryRun.query.filter_by(run_date=local_date).first()
+    stale_before = datetime.utcnow() - timedelta(minutes=DELIVERY_STALE_MINUTES)
+    if run is not None and run.status == 'running' and run.updated_at > stale_before:
+        print(f"Skipping {local_date}: delivery run {run.id} is in progress elsewhere.")
+        return
+    if not buckets:
+        return
+    pending = _not_yet_sent(run.id if run is not None else None)
+    in_buckets = or_(*(and_(User.timezone == timezone_name, User.send_hour == send_hour) for timezone_name, send_hour in buckets))
+    if db.session.execute(select(User.id).where(in_buckets, pending).limit(1)).first() is None:
+        # Nothing left to send; close out a run that crashed after its last checkpoint.
+        if run is not None and run.status == 'running':
+            _finish_delivery_run(run)
+        return
 
-        subject = f"Word of the Day: {word_of_day.title}"
-        content = word_of_day.to_dict()
-        send_email_to_recipients(subject, content, recipient_emails)
+    word = db.session.query(Word).filter(Word.published_date == local_date).first()
+    if not word:
+        print(f"Skipping {local_date}: No word of the day found.")
+        return
+    run = _start_delivery_run(run, local_date, word, buckets)
+    if run is None:
+        return
+
+    subject = f"Word of the Day: {word.title}"
+    content = word.to_dict()
+    log = DeliveryLog(run.id)
+    stats = send_email_to_recipients(subject, content, iter_recipient_emails(buckets, exclude_run_id=run.id), on_result=log.record)
+    log.flush()
+    if stats is None:
+        return
+    _finish_delivery_run(run, interrupted=stats.aborted)
+
+def resume_interrupted_delivery():
+    """Re-send the buckets of recent runs left incomplete or whose process stopped checkpointing.
+
+    Unlike the hourly dispatch this is not limited to the catch-up window: a run resumes every
+    bucket it was started for.
+    """
+    if not _delivery_lock.acquire(blocking=False):
+        print("Resume skipped: a delivery is already running in this process.")
+        return
+    try:
+        with app.app_context():
+            since = datetime.now(APP_TIMEZONE).date() - timedelta(days=1)
+            stale_before = datetime.utcnow() - timedelta(minutes=DELIVERY_STALE_MINUTES)
+            interrupted = [
+                (run.id, run.run_date, [tuple(bucket) for bucket in json.loads(run.buckets)])
+                for run in DeliveryRun.query.filter(
+                    DeliveryRun.run_date >= since,
+                    or_(DeliveryRun.status == 'incomplete', and_(DeliveryRun.status == 'running', DeliveryRun.updated_at <= stale_before)),
+                )
+            ]
+            for run_id, run_date, buckets in interrupted:
+                print(f"Resuming delivery run {run_id} for {run_date}.")
+                _send_word_for_date(run_date, buckets)
+    finally:
+        _delivery_lock.release()
 
 
 # --- 7. Scheduler and App Execution ---
-# Initialize the database within the application context
-with app.app_context():
-    db.create_all()
+# Set RUN_SCHEDULER=false on web workers when the scheduler runs as its own process
+# (python -m scheduler). Either way only the instance holding the leader lock sends.
+RUN_SCHEDULER = os.getenv("RUN_SCHEDULER", "true").lower() in ('1', 'true', 'yes')
+LEADER_LOCK_KEY = int(os.getenv("LEADER_LOCK_KEY", 0x776f7264))
+LEADER_LOCK_FILE = os.getenv("LEADER_LOCK_FILE")
+
+class PostgresLeaderLock:
+    """Session-level advisory lock held on a dedicated connection for as long as this process leads."""
+
+    def __init__(self, engine, key: int):
+        self.engine = engine
+        self.key = key
+        self.connection = None
+
+    def acquire(self) -> bool:
+        if self.connection is not None:
+            try:
+                # The lock dies with the session, so make sure the session is still there.
+                self.connection.exec_driver_sql("SELECT 1")
+                return True
+            except Exception:
+                self.release()
+        # Autocommit, so neither the lock nor the health check leaves the session "idle in
+        # transaction", where idle_in_transaction_session_timeout would end it and the lock.
+        connection = self.engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+        try:
+            if connection.exec_driver_sql(f"SELECT pg_try_advisory_lock({self.key})").scalar():
+                self.connection = connection
+                return True
+        except Exception as e:
+            print(f"Could not take scheduler leader lock: {e}")
+        connection.close()
+        return False
+
+    def release(self):
+        if self.connection is not None:
+            try:
+                self.connection.close()
+            except Exception:
+                pass
+            self.connection = None
+
+class FileLeaderLock:
+    """Exclusive flock on a file; enough for SQLite, where every process shares one host."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.handle = None
+
+    def acquire(self) -> bool:
+        import fcntl
+        if self.handle is not None:
+            return True
+        handle = open(self.path, 'a')
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return False
+        self.handle = handle
+        return True
+
+    def release(self):
+        if self.handle is not None:
+            self.handle.close()
+            self.handle = None
+
+_leader_lock = None
+_leader_lock_guard = threading.Lock()
+
+def get_leader_lock():
+    global _leader_lock
+    with _leader_lock_guard:
+        if _leader_lock is None:
+            with app.app_context():
+                if db.engine.dialect.name == 'postgresql':
+                    _leader_lock = PostgresLeaderLock(db.engine, LEADER_LOCK_KEY)
+                else:
+                    path = LEADER_LOCK_FILE
+                    if path is None:
+                        database = db.engine.url.database
+                        if database and database != ':memory:':
+                            path = database + '.scheduler.lock'
+                        else:
+                            path = os.path.join(tempfile.gettempdir(), 'aiword-scheduler.lock')
+                    _leader_lock = FileLeaderLock(path)
+        return _leader_lock
+
+def run_as_leader(job: Callable[[], None]) -> Callable[[], None]:
+    """Wrap a scheduled job so it only runs in the process that holds (or can take) the leader lock."""
+    @functools.wraps(job)
+    def wrapper():
+        lock = get_leader_lock()
+        with _leader_lock_guard:
+            is_leader = lock.acquire()
+        if not is_leader:
+            print(f"Skipping {job.__name__}: another instance holds the scheduler lock.")
+            return
+        job()
+    return wrapper
+
+def configure_scheduler(scheduler):
+    # Hourly: each run sends to the subscriber buckets whose local send time has come.
+    scheduler.add_job(run_as_leader(send_daily_word_job), 'cron', minute=DELIVERY_MINUTE)
+    # Picks up a delivery run left behind by a crashed process or a flaky relay.
+    scheduler.add_job(run_as_leader(resume_interrupted_delivery), 'interval', minutes=DELIVERY_RETRY_MINUTES, next_run_time=datetime.now(APP_TIMEZONE))
+    return scheduler
 
-# This check prevents the scheduler from running twice when Flask is in debug mode
-if not app.debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
-    scheduler = BackgroundScheduler(timezone=pytz.timezone('US/Eastern'))
-    scheduler.add_job(send_daily_word_job, 'cron', hour=os.getenv("HOUR"), minute=os.getenv("MINUTE"))
+def upgrade_schema():
+    """Add columns introduced after a table was first created; create_all() only creates missing tables."""
+    added_columns = {
+        User.__table__: [
+            ('timezone', f"VARCHAR(64) NOT NULL DEFAULT '{APP_TIMEZONE.zone}'"),
+            ('send_hour', f"INTEGER NOT NULL DEFAULT {DEFAULT_SEND_HOUR}"),
+        ],
+    }
+    with app.app_context():
+        inspector = inspect(db.engine)
+        preparer = db.engine.dialect.identifier_preparer
+        with db.engine.begin() as connection:
+            for table, columns in added_columns.items():
+                existing = {column['name'] for column in inspector.get_columns(table.name)}
+                for name, ddl in columns:
+                    if name not in existing:
+                        connection.exec_driver_sql(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {name} {ddl}")
+                for index in table.indexes:
+                    index.create(connection, checkfirst=True)
+
+def normalize_stored_emails():
+    """Lower-case emails stored before signups were normalized, and report the ones that collide.
+
+    An address whose normalized form already belongs to another subscriber is left as it is
+    (the unique index would reject the update); those duplicates need to be merged by hand.
+    """
+    with app.app_context():
+        rows = db.session.execute(
+            select(User.id, User.email).where(User.email != func.lower(func.trim(User.email))).order_by(User.id)
+        ).all()
+        if not rows:
+            return
+        taken = set(db.session.execute(
+            select(User.email).where(User.email.in_({normalize_email(row.email) for row in rows}))
+        ).scalars())
+        collisions = []
+        for row in rows:
+            address = normalize_email(row.email)
+            if address in taken:
+                collisions.append(row)
+                continue
+            db.session.execute(update(User).where(User.id == row.id).values(email=address))
+            taken.add(address)
+        db.session.commit()
+        print(f"Normalized {len(rows) - len(collisions)} subscriber emails.")
+        for row in collisions:
+            print(f"Duplicate subscriber {row.id}: {row.email} is already registered in lower case.")
+
+def init_db():
+    """Create missing tables, bring existing ones up to date and set up full-text search."""
+    with app.app_context():
+        db.create_all()
+    upgrade_schema()
+    normalize_stored_emails()
+    ensure_search_index()
+    with app.app_context():
+        # Seed the subscriber counter so the first /users/count requests do not race to create it.
+        if db.session.get(Counter, USER_COUNTER) is None:
+            reconcile_user_count()
+
+@app.cli.command('init-db')
+def init_db_command():
+    """Create or upgrade the database schema. Run once per deploy, before starting workers."""
+    init_db()
+    report_engine_settings()
+    print("Database initialized.")
+
+def start_scheduler():
+    """Run the scheduled jobs on a background thread of this process."""
+    from apscheduler.schedulers.background import BackgroundScheduler
+    scheduler = configure_scheduler(BackgroundScheduler(timezone=APP_TIMEZONE))
     scheduler.start()
     print("Scheduler started.")
+    return scheduler
+
+def create_app() -> Flask:
+    """Application factory for WSGI servers, e.g. gunicorn 'app:create_app()'.
+
+    Importing this module touches neither the database nor the network and starts no
+    threads, so workers boot fast and gunicorn --preload is safe. The schema is created by
+    `flask --app app init-db`; the scheduler is started per worker by gunicorn.conf.py
+    (or runs on its own with python -m scheduler).
+    """
+    return app
 
 if __name__ == '__main__':
     # This runs the Flask development server.
-    # For production, use a WSGI server like Gunicorn: gunicorn --bind 0.0.0.0:8000 app:app
+    # For production, run `flask --app app init-db` once, then a WSGI server like Gunicorn:
+    # gunicorn --bind 0.0.0.0:8000 'app:create_app()'
     # app.run(debug=True, host='0.0.0.0', port=8000)
     # app.run(debug=True, host='0.0.0.0')
+    init_db()
+    report_engine_settings()
+    # The reloader runs this file twice; only its child process serves and schedules.
+    if RUN_SCHEDULER and os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_scheduler()
     app.run(debug=True, host='0.0.0.0', port=8000)
     # with app.app_context():
     #     print(f"Running scheduled job at {datetime.now(pytz.timezone('US/Eastern'))}")
@@ -0,0 +1,277 @@
+"""Load and fan-out benchmarks for app.py.
+
+    python bench.py --subscribers 10000 --requests 2000 --concurrency 16
+    python bench.py --database-url postgresql://localhost/aiword_bench --subscribers 1000000
+
+The HTTP scenarios drive the Flask app in-process through its test client, or a running
+server with --url (which must use the same database as --database-url). The fan-out
+scenario runs send_daily_word_job against a stub SMTP server started on localhost.
+Each run appends one JSON line to --output so results can be compared over time.
+"""
+import argparse
+import json
+import os
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+
+class StubSMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib: accepts every command and counts delivered messages."""
+
+    def reply(self, line: str):
+        self.wfile.write(line.encode() + b'\r\n')
+
+    def handle(self):
+        self.reply('220 stub ESMTP')
+        recipients = 0
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            verb = line.split(b' ', 1)[0].strip().upper()
+            if verb in (b'EHLO', b'HELO'):
+                self.wfile.write(b'250-stub\r\n250-AUTH PLAIN\r\n250 8BITMIME\r\n')
+            elif verb == b'AUTH':
+                self.reply('235 Authentication successful')
+            elif verb == b'RCPT':
+                recipients += 1
+                self.reply('250 OK')
+            elif verb == b'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                while True:
+                    data = self.rfile.readline()
+                    if not data or data == b'.\r\n':
+                        break
+                self.server.delivered(recipients)
+                recipients = 0
+                self.reply('250 Queued')
+            elif verb == b'RSET':
+                recipients = 0
+                self.reply('250 OK')
+            elif verb == b'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('250 OK')
+
+
+class StubSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), StubSMTPHandler)
+        self.lock = threading.Lock()
+        self.messages = 0
+        self.recipients = 0
+
+    def delivered(self, recipients: int):
+        with self.lock:
+            self.messages += 1
+            self.recipients += recipients
+
+
+def percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, round(pct / 100 * len(values)) - 1))
+    return values[index]
+
+
+def run_scenario(name: str, send, total: int, concurrency: int) -> dict:
+    def one(i):
+        started = time.perf_counter()
+        try:
+            status = send(i)
+        except Exception:
+            status = 599
+        return time.perf_counter() - started, status
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        results = list(pool.map(one, range(total)))
+    elapsed = time.perf_counter() - started
+    latencies = sorted(latency for latency, _ in results)
+    errors = sum(1 for _, status in results if status >= 400)
+    result = {
+        'name': name,
+        'requests': total,
+        'concurrency': concurrency,
+        'errors': errors,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        'throughput_rps': round(total / elapsed, 1),
+    }
+    print(f"{name:<22} p50 {result['p50_ms']:>8.2f} ms  p99 {result['p99_ms']:>8.2f} ms  "
+          f"{result['throughput_rps']:>9.1f} req/s  errors {errors}")
+    return result
+
+
+def make_client(app, base_url, admin_token: str):
+    """Return request(method, path, body) -> status, either in-process or over HTTP."""
+    headers = {'Authorization': f'Bearer {admin_token}'}
+    if base_url is None:
+        local = threading.local()
+
+        def request(method, path, body=None):
+            if not hasattr(local, 'client'):
+                local.client = app.test_client()
+            return local.client.open(path, method=method, json=body, headers=headers).status_code
+        return request
+
+    def request(method, path, body=None):
+        data = json.dumps(body).encode() if body is not None else None
+        req = urllib.request.Request(base_url.rstrip('/') + path, data=data, method=method,
+                                     headers={'Content-Type': 'application/json', **headers})
+        try:
+            with urllib.request.urlopen(req) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+    return request
+
+
+def seed(app_module, subscribers: int, batch_size: int = 5000):
+    m = app_module
+    with m.app.app_context():
+        today = datetime.now(m.APP_TIMEZONE).date()
+        m.upsert_words([{'title': 'Benchmark', 'description': 'A standard for comparison.',
+                         'example': 'The benchmark ran overnight.', 'published_date': today}])
+        m.db.session.commit()
+        now = datetime.utcnow()
+        for start in range(0, subscribers, batch_size):
+            rows = [{'name': f'Subscriber {i}', 'email': f'subscriber-{i}@example.com', 'joined_date': now}
+                    for i in range(start, min(start + batch_size, subscribers))]
+            m.insert_ignoring_conflicts(m.User, rows)
+            m.db.session.commit()
+        m.reconcile_user_count()
+
+
+def run_fanout(app_module, smtp: StubSMTPServer) -> dict:
+    m = app_module
+    with m.app.app_context():
+        # Start from a clean delivery log so the job sends to everyone again.
+        today = datetime.now(m.APP_TIMEZONE).date()
+        run = m.DeliveryRun.query.filter_by(run_date=today).first()
+        if run is not None:
+            m.Delivery.query.filter_by(run_id=run.id).delete()
+            m.db.session.delete(run)
+            m.db.session.commit()
+    # Seeded subscribers share the default bucket; dispatch at its send time.
+    send_at = m.APP_TIMEZONE.localize(datetime.combine(today, datetime.min.time()).replace(
+        hour=m.DEFAULT_SEND_HOUR, minute=m.DELIVERY_MINUTE))
+    started = time.perf_counter()
+    m.send_daily_word_job(now=send_at)
+    elapsed = time.perf_counter() - started
+    result = {
+        'name': 'send_daily_word_job',
+        'messages': smtp.messages,
+        'recipients': smtp.recipients,
+        'seconds': round(elapsed, 3),
+        'recipients_per_second': round(smtp.recipients / elapsed, 1) if elapsed else 0.0,
+    }
+    print(f"{'send_daily_word_job':<22} {smtp.recipients} recipients in {elapsed:.2f}s "
+          f"({result['recipients_per_second']:.1f}/s)")
+    return result
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return ''
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--database-url', help='defaults to a fresh SQLite file in a temp directory')
+    parser.add_argument('--url', help='benchmark a running server instead of the in-process app')
+    parser.add_argument('--admin-token', default=os.getenv('ADMIN_TOKEN', 'bench'),
+                        help="for POST /words/bulk; must match the server's ADMIN_TOKEN with --url")
+    parser.add_argument('--subscribers', type=int, default=10000)
+    parser.add_argument('--requests', type=int, default=1000, help='requests per HTTP scenario')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--bulk-size', type=int, default=50, help='words per POST /words/bulk request')
+    parser.add_argument('--skip-http', action='store_true')
+    parser.add_argument('--skip-fanout', action='store_true')
+    parser.add_argument('--output', default='bench_results.jsonl')
+    args = parser.parse_args(argv)
+
+    smtp = StubSMTPServer()
+    threading.Thread(target=smtp.serve_forever, daemon=True).start()
+
+    # app.py reads its configuration at import time.
+    database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='aiword-bench-'), 'bench.db')}"
+    os.environ.update({
+        'DATABASE_URL': database_url,
+        'RUN_SCHEDULER': 'false',
+        'SMTP_SERVER': '127.0.0.1',
+        'SMTP_PORT': str(smtp.server_address[1]),
+        'SMTP_USERNAME': 'bench',
+        'SMTP_PASSWORD': 'bench',
+        'SENDER_EMAIL': 'bench@example.com',
+        'SMTP_STARTTLS': 'false',
+        'ADMIN_TOKEN': args.admin_token,
+    })
+    import app as app_module
+    app_module.init_db()
+
+    with app_module.app.app_context():
+        engine = app_module.db.engine
+        dialect, url = engine.dialect.name, engine.url.render_as_string(hide_password=True)
+    print(f"Seeding {args.subscribers} subscribers into {url}...")
+    seed(app_module, args.subscribers)
+
+    run_id = int(time.time())
+    scenarios = []
+    if not args.skip_http:
+        request = make_client(app_module.app, args.url, args.admin_token)
+        # Far-future dates keep /words/today stable; reruns simply upsert over them.
+        bulk_start = datetime(2100, 1, 1).date()
+
+        def bulk_words(i):
+            first = bulk_start + timedelta(days=i * args.bulk_size)
+            words = [{'title': f'Word {i}-{j}', 'description': 'Benchmark word.', 'example': 'An example.',
+                      'published_date': (first + timedelta(days=j)).isoformat()} for j in range(args.bulk_size)]
+            return request('POST', '/words/bulk', words)
+
+        scenarios = [
+            run_scenario('POST /users/', lambda i: request(
+                'POST', '/users/', {'name': f'Bench {i}', 'email': f'bench-{run_id}-{i}@example.com'}),
+                args.requests, args.concurrency),
+            run_scenario('GET /words/today', lambda i: request('GET', '/words/today'), args.requests, args.concurrency),
+            run_scenario('GET /users/count', lambda i: request('GET', '/users/count'), args.requests, args.concurrency),
+            run_scenario('GET /words/', lambda i: request('GET', '/words/?limit=100'), args.requests, args.concurrency),
+            run_scenario('POST /words/bulk', bulk_words, max(args.requests // 10, 1), args.concurrency),
+        ]
+
+    fanout = None if args.skip_fanout else run_fanout(app_module, smtp)
+
+    record = {
+        'timestamp': datetime.utcnow().isoformat() + 'Z',
+        'commit': git_commit(),
+        'python': sys.version.split()[0],
+        'database': dialect,
+        'target': args.url or 'in-process',
+        'subscribers': args.subscribers,
+        'smtp_workers': app_module.SMTP_WORKERS,
+        'scenarios': scenarios,
+        'fanout': fanout,
+    }
+    with open(args.output, 'a') as f:
+        f.write(json.dumps(record) + '\n')
+    print(f"Results appended to {args.output}")
+    smtp.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+"""Gunicorn settings, picked up automatically when gunicorn is started from this directory."""
+import os
+import shutil
+import tempfile
+
+# Workers share their Prometheus samples through this directory (see /metrics in app.py).
+# It must exist before app.py is imported, which under --preload happens right after this
+# file is loaded, so it is created here. A directory this file picked itself is also emptied,
+# to start every deployment from zero; one given in the environment may be shared, so it is
+# only created.
+if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = os.path.join(tempfile.gettempdir(), "aiword-metrics")
+    # A SIGHUP reload or USR2 upgrade inherits the variable, so live workers' files are kept.
+    shutil.rmtree(os.environ["PROMETHEUS_MULTIPROC_DIR"], ignore_errors=True)
+os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+# Group commit (USER_GROUP_COMMIT in app.py) batches the signups one worker is handling at
+# the same moment. A sync worker handles one request at a time, so every batch would hold a
+# single row and only add latency; give the workers threads instead.
+if os.getenv("USER_GROUP_COMMIT", "false").lower() in ('1', 'true', 'yes'):
+    worker_class = "gthread"
+    threads = int(os.getenv("GUNICORN_THREADS", 16))
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def post_worker_init(worker):
+    import app
+    # Under --preload the engine was created in the master; never share its connections.
+    with app.app.app_context():
+        app.db.engine.dispose(close=False)
+    # Every worker schedules; the leader lock in app.py picks the one that sends.
+    if app.RUN_SCHEDULER:
+        app.start_scheduler()
@@ -0,0 +1,34 @@
+"""Standalone scheduler process.
+
+Run ``python -m scheduler`` once per deployment and start the web workers with
+RUN_SCHEDULER=false so gunicorn.conf.py starts no scheduler threads in them. The
+leader lock in app.py still guarantees a single sender if more than one scheduler
+is started.
+
+The email-job metrics of this process are served for Prometheus on
+SCHEDULER_METRICS_PORT (0 disables it). They are kept in this process rather
+than in the web workers' PROMETHEUS_MULTIPROC_DIR, which gunicorn may empty on
+restart and which nothing here would ever mark dead.
+"""
+import os
+
+# Must happen before prometheus_client is imported, which picks its value store then.
+os.environ.pop("PROMETHEUS_MULTIPROC_DIR", None)
+
+import prometheus_client
+from apscheduler.schedulers.blocking import BlockingScheduler
+
+from app import APP_TIMEZONE, configure_scheduler
+
+SCHEDULER_METRICS_PORT = int(os.getenv("SCHEDULER_METRICS_PORT", 9101))
+
+if __name__ == '__main__':
+    if SCHEDULER_METRICS_PORT:
+        prometheus_client.start_http_server(SCHEDULER_METRICS_PORT)
+        print(f"Scheduler metrics on port {SCHEDULER_METRICS_PORT}.")
+    scheduler = configure_scheduler(BlockingScheduler(timezone=APP_TIMEZONE))
+    print("Scheduler started.")
+    try:
+        scheduler.start()
+    except (KeyboardInterrupt, SystemExit):
+        pass
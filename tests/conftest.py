@@ -0,0 +1,33 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# app.py reads its configuration at import time, so point it at a throwaway database first.
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(prefix='aiword-test-'), 'test.db')
+os.environ['RUN_SCHEDULER'] = 'false'
+os.environ.pop('PROMETHEUS_MULTIPROC_DIR', None)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as app_module  # noqa: E402
+
+app_module.init_db()
+
+
+@pytest.fixture
+def aiword():
+    """The app module, with the subscriber tables emptied before each test."""
+    with app_module.app.app_context():
+        app_module.Delivery.query.delete()
+        app_module.DeliveryRun.query.delete()
+        app_module.User.query.delete()
+        app_module.set_counter(app_module.USER_COUNTER, 0)
+        app_module.db.session.commit()
+    app_module.user_count_cache.invalidate()
+    return app_module
+
+
+@pytest.fixture
+def client(aiword):
+    return aiword.app.test_client()
@@ -0,0 +1,40 @@
+from datetime import date
+
+import pytest
+
+
+@pytest.mark.parametrize('direction', ['next', 'prev'])
+def test_round_trip(aiword, direction):
+    token = aiword.encode_cursor(date(2024, 2, 29), direction)
+    assert '=' not in token
+    assert aiword.decode_cursor(token) == (date(2024, 2, 29), direction)
+
+
+# The last token is valid base64 JSON with an unknown direction.
+@pytest.mark.parametrize('token', ['', 'not-base64!', 'e30', 'eyJkIjogIjIwMjQtMDItMjkiLCAiZGlyIjogInVwIn0'])
+def test_rejects_malformed_tokens(aiword, token):
+    with pytest.raises(ValueError, match='Invalid cursor'):
+        aiword.decode_cursor(token)
+
+
+def test_bad_cursor_is_a_400(client):
+    response = client.get('/words/?cursor=garbage')
+    assert response.status_code == 400
+
+
+def test_pages_follow_the_cursor_headers(aiword, client):
+    with aiword.app.app_context():
+        aiword.upsert_words([{'title': f'Word {day}', 'description': 'd', 'example': 'e', 'published_date': date(1990, 1, day)}
+                             for day in range(1, 6)])
+        aiword.db.session.commit()
+    seen, pages = [], 0
+    response = client.get('/words/?limit=2&to=1990-01-05')
+    while True:
+        seen += [word['title'] for word in response.get_json()]
+        pages += 1
+        cursor = response.headers.get('X-Next-Cursor')
+        if not cursor:
+            break
+        response = client.get(f'/words/?limit=2&to=1990-01-05&cursor={cursor}')
+    assert seen == [f'Word {day}' for day in range(1, 6)]
+    assert pages == 3
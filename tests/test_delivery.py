@@ -0,0 +1,214 @@
+import json
+import socketserver
+import threading
+from collections import Counter
+from datetime import datetime, time, timedelta
+
+import pytest
+import pytz
+
+
+class RelayHandler(socketserver.StreamRequestHandler):
+    """bench.StubSMTPHandler with scripted AUTH and per-address RCPT replies."""
+
+    def reply(self, line: str):
+        self.wfile.write(line.encode() + b'\r\n')
+
+    def handle(self):
+        self.reply('220 stub ESMTP')
+        accepted = []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            verb = line.split(b' ', 1)[0].strip().upper()
+            if verb in (b'EHLO', b'HELO'):
+                self.wfile.write(b'250-stub\r\n250-AUTH PLAIN\r\n250 8BITMIME\r\n')
+            elif verb == b'AUTH':
+                self.reply(self.server.auth_reply)
+            elif verb == b'RCPT':
+                address = line.decode().split('<', 1)[1].split('>', 1)[0]
+                response = self.server.rcpt(address)
+                if response.startswith('250'):
+                    accepted.append(address)
+                self.reply(response)
+            elif verb == b'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                while True:
+                    data = self.rfile.readline()
+                    if not data or data == b'.\r\n':
+                        break
+                self.server.delivered(accepted)
+                accepted = []
+                self.reply('250 Queued')
+            elif verb == b'RSET':
+                accepted = []
+                self.reply('250 OK')
+            elif verb == b'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('250 OK')
+
+
+class Relay(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), RelayHandler)
+        self.lock = threading.Lock()
+        self.auth_reply = '235 Authentication successful'
+        self.rcpt_replies = {}
+        self.tried = Counter()
+        self.received = Counter()
+
+    def rcpt(self, address: str) -> str:
+        with self.lock:
+            self.tried[address] += 1
+        return self.rcpt_replies.get(address, '250 OK')
+
+    def delivered(self, addresses):
+        with self.lock:
+            self.received.update(addresses)
+
+
+@pytest.fixture
+def relay(aiword, monkeypatch):
+    server = Relay()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    for name, value in {'SMTP_SERVER': '127.0.0.1', 'SMTP_PORT': server.server_address[1], 'SMTP_USERNAME': 'user',
+                        'SMTP_PASSWORD': 'secret', 'SENDER_EMAIL': 'word@example.com', 'SMTP_STARTTLS': False,
+                        'SMTP_RETRY_BACKOFF': 0, 'SMTP_WORKERS': 2, 'SMTP_BCC_BATCH_SIZE': 0, 'DELIVERY_MINUTE': 0}.items():
+        monkeypatch.setattr(aiword, name, value)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+# resume_interrupted_delivery only looks back a day, so the runs are dated around the real today.
+TODAY = datetime.now(pytz.utc).date()
+
+
+def at(hour: int, minute: int = 5, day=TODAY) -> datetime:
+    return datetime.combine(day, time(hour, minute), tzinfo=pytz.utc)
+
+
+def subscribe(aiword, *emails, send_hour=8):
+    with aiword.app.app_context():
+        aiword.db.session.add_all(aiword.User(name='Test', email=email, timezone='UTC', send_hour=send_hour) for email in emails)
+        aiword.db.session.commit()
+
+
+def publish(aiword, day=TODAY):
+    with aiword.app.app_context():
+        aiword.upsert_words([{'title': f'Word {day}', 'description': 'd', 'example': 'e', 'published_date': day}])
+        aiword.db.session.commit()
+
+
+def delivery_run(aiword, day=TODAY):
+    with aiword.app.app_context():
+        run = aiword.DeliveryRun.query.filter_by(run_date=day).one()
+        statuses = {delivery.email: (delivery.status, delivery.attempts)
+                    for delivery in aiword.Delivery.query.filter_by(run_id=run.id)}
+        return run.status, json.loads(run.buckets), statuses
+
+
+def test_clean_send(aiword, relay):
+    subscribe(aiword, 'a@example.com', 'b@example.com')
+    publish(aiword)
+    aiword.send_daily_word_job(now=at(8))
+    assert relay.received == {'a@example.com': 1, 'b@example.com': 1}
+    status, _, statuses = delivery_run(aiword)
+    assert status == 'completed'
+    assert statuses == {'a@example.com': ('sent', 1), 'b@example.com': ('sent', 1)}
+    # The next tick finds nothing left to send.
+    aiword.send_daily_word_job(now=at(9))
+    assert relay.received == {'a@example.com': 1, 'b@example.com': 1}
+
+
+def test_transient_refusal_is_retried_up_to_the_attempt_cap(aiword, relay):
+    subscribe(aiword, 'ok@example.com', 'busy@example.com')
+    publish(aiword)
+    relay.rcpt_replies['busy@example.com'] = '450 Mailbox busy'
+    aiword.send_daily_word_job(now=at(8))
+    assert delivery_run(aiword)[0] == 'incomplete'
+    for _ in range(aiword.DELIVERY_MAX_ATTEMPTS + 1):
+        aiword.resume_interrupted_delivery()
+    assert relay.tried['busy@example.com'] == aiword.DELIVERY_MAX_ATTEMPTS
+    assert relay.received == {'ok@example.com': 1}
+    status, _, statuses = delivery_run(aiword)
+    assert status == 'completed'
+    assert statuses['busy@example.com'] == ('failed', aiword.DELIVERY_MAX_ATTEMPTS)
+
+
+def test_permanent_refusal_is_not_retried(aiword, relay):
+    subscribe(aiword, 'ok@example.com', 'gone@example.com')
+    publish(aiword)
+    relay.rcpt_replies['gone@example.com'] = '550 No such user'
+    aiword.send_daily_word_job(now=at(8))
+    aiword.send_daily_word_job(now=at(9))
+    aiword.resume_interrupted_delivery()
+    assert relay.tried['gone@example.com'] == 1
+    status, _, statuses = delivery_run(aiword)
+    assert status == 'completed'
+    assert statuses == {'ok@example.com': ('sent', 1), 'gone@example.com': ('rejected', 1)}
+
+
+def test_auth_failure_leaves_the_run_resumable(aiword, relay):
+    subscribe(aiword, 'a@example.com', 'b@example.com')
+    publish(aiword)
+    relay.auth_reply = '535 Authentication credentials invalid'
+    aiword.send_daily_word_job(now=at(8))
+    status, _, statuses = delivery_run(aiword)
+    # Nobody was tried, so nobody is marked failed or rejected.
+    assert status == 'incomplete'
+    assert statuses == {}
+    assert not relay.tried
+    relay.auth_reply = '235 Authentication successful'
+    aiword.resume_interrupted_delivery()
+    assert relay.received == {'a@example.com': 1, 'b@example.com': 1}
+    assert delivery_run(aiword)[0] == 'completed'
+
+
+def test_later_bucket_continues_the_same_run(aiword, relay):
+    subscribe(aiword, 'early@example.com', send_hour=8)
+    subscribe(aiword, 'late@example.com', send_hour=10)
+    publish(aiword)
+    aiword.send_daily_word_job(now=at(8))
+    assert relay.received == {'early@example.com': 1}
+    aiword.send_daily_word_job(now=at(10))
+    assert relay.received == {'early@example.com': 1, 'late@example.com': 1}
+    with aiword.app.app_context():
+        assert aiword.DeliveryRun.query.count() == 1
+    status, buckets, _ = delivery_run(aiword)
+    assert status == 'completed'
+    assert buckets == [['UTC', 6], ['UTC', 7], ['UTC', 8], ['UTC', 9], ['UTC', 10]]
+
+
+def test_catch_up_crosses_local_midnight(aiword, relay):
+    yesterday = TODAY - timedelta(days=1)
+    subscribe(aiword, 'owl@example.com', send_hour=23)
+    publish(aiword, yesterday)
+    aiword.send_daily_word_job(now=at(0, 30))
+    assert relay.received == {'owl@example.com': 1}
+    assert delivery_run(aiword, yesterday)[0] == 'completed'
+
+
+def test_resume_closes_a_run_that_crashed_after_its_last_checkpoint(aiword, relay):
+    subscribe(aiword, 'a@example.com', 'b@example.com')
+    publish(aiword)
+    with aiword.app.app_context():
+        word = aiword.Word.query.filter_by(published_date=TODAY).one()
+        run = aiword.DeliveryRun(run_date=TODAY, word_id=word.id, buckets='[["UTC", 8]]',
+                                 updated_at=datetime.utcnow() - timedelta(minutes=aiword.DELIVERY_STALE_MINUTES + 1))
+        aiword.db.session.add(run)
+        aiword.db.session.flush()
+        aiword.db.session.add_all(aiword.Delivery(run_id=run.id, email=email, status='sent')
+                                  for email in ('a@example.com', 'b@example.com'))
+        aiword.db.session.commit()
+    aiword.resume_interrupted_delivery()
+    assert not relay.tried
+    with aiword.app.app_context():
+        run = aiword.DeliveryRun.query.filter_by(run_date=TODAY).one()
+        assert (run.status, run.sent_count, run.failed_count) == ('completed', 2, 0)
@@ -0,0 +1,28 @@
+def test_file_lock_is_exclusive_until_released(aiword, tmp_path):
+    path = str(tmp_path / 'scheduler.lock')
+    leader, follower = aiword.FileLeaderLock(path), aiword.FileLeaderLock(path)
+
+    assert leader.acquire()
+    assert leader.acquire(), 'the holder keeps leading'
+    assert not follower.acquire()
+
+    leader.release()
+    assert follower.acquire()
+    follower.release()
+
+
+def test_run_as_leader_skips_jobs_without_the_lock(aiword, tmp_path, monkeypatch):
+    path = str(tmp_path / 'scheduler.lock')
+    other_instance = aiword.FileLeaderLock(path)
+    monkeypatch.setattr(aiword, '_leader_lock', aiword.FileLeaderLock(path))
+    calls = []
+    job = aiword.run_as_leader(lambda: calls.append('ran'))
+
+    assert other_instance.acquire()
+    job()
+    assert calls == []
+
+    other_instance.release()
+    job()
+    assert calls == ['ran']
+    aiword._leader_lock.release()
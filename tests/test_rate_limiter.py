@@ -0,0 +1,36 @@
+import threading
+import time
+
+
+def test_unlimited_never_blocks(aiword):
+    limiter = aiword.RateLimiter(0)
+    started = time.monotonic()
+    for _ in range(10000):
+        limiter.acquire()
+    assert time.monotonic() - started < 1
+
+
+def test_burst_then_steady_rate(aiword):
+    limiter = aiword.RateLimiter(50)
+    started = time.monotonic()
+    # The first second's worth of tokens is available immediately...
+    for _ in range(50):
+        limiter.acquire()
+    assert time.monotonic() - started < 0.2
+    # ...after which acquires are paced at the configured rate.
+    for _ in range(25):
+        limiter.acquire()
+    assert 0.4 <= time.monotonic() - started < 1.0
+
+
+def test_rate_is_shared_across_threads(aiword):
+    limiter = aiword.RateLimiter(100)
+    for _ in range(100):
+        limiter.acquire()
+    started = time.monotonic()
+    threads = [threading.Thread(target=lambda: [limiter.acquire() for _ in range(10)]) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert 0.4 <= time.monotonic() - started < 1.0
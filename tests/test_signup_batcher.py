@@ -0,0 +1,126 @@
+import queue
+import threading
+from datetime import datetime
+
+import pytest
+
+
+def signup(aiword, email, **extra):
+    row = {'name': 'Test', 'email': email, 'joined_date': datetime.utcnow(),
+           'timezone': aiword.APP_TIMEZONE.zone, 'send_hour': aiword.DEFAULT_SEND_HOUR}
+    row.update(extra)
+    return row
+
+
+def user_emails(aiword):
+    with aiword.app.app_context():
+        return sorted(user.email for user in aiword.User.query)
+
+
+@pytest.fixture
+def group_commit(aiword, monkeypatch):
+    """Route POST /users/ through a fresh batcher; yields it for the test to inspect."""
+    batcher = aiword.SignupBatcher(max_rows=50, max_latency_ms=50, queue_size=100)
+    monkeypatch.setattr(aiword, 'USER_GROUP_COMMIT', True)
+    monkeypatch.setattr(aiword, 'signup_batcher', batcher)
+    yield batcher
+    batcher.close()
+
+
+def test_concurrent_signups_share_one_insert(aiword, monkeypatch):
+    inserts = []
+    insert_signups = aiword.insert_signups
+
+    def counting_insert(rows):
+        inserts.append(len(rows))
+        return insert_signups(rows)
+    monkeypatch.setattr(aiword, 'insert_signups', counting_insert)
+
+    batcher = aiword.SignupBatcher(max_rows=10, max_latency_ms=500, queue_size=100)
+    futures = [batcher.submit(signup(aiword, f'user{i}@example.com')) for i in range(10)]
+    results = [future.result(timeout=5) for future in futures]
+    batcher.close()
+
+    assert inserts == [10]
+    assert [user['email'] for user in results] == [f'user{i}@example.com' for i in range(10)]
+    assert len(user_emails(aiword)) == 10
+    with aiword.app.app_context():
+        assert aiword.db.session.get(aiword.Counter, aiword.USER_COUNTER).value == 10
+
+
+def test_duplicates_within_a_batch_and_against_the_table(aiword):
+    batcher = aiword.SignupBatcher(max_rows=10, max_latency_ms=500, queue_size=100)
+    assert batcher.submit(signup(aiword, 'existing@example.com')).result(timeout=5) is not None
+
+    first = batcher.submit(signup(aiword, 'twice@example.com', name='First'))
+    second = batcher.submit(signup(aiword, 'twice@example.com', name='Second'))
+    existing = batcher.submit(signup(aiword, 'existing@example.com'))
+    batcher.close()
+
+    assert first.result(timeout=5)['name'] == 'First'
+    assert second.result(timeout=5) is None
+    assert existing.result(timeout=5) is None
+    assert user_emails(aiword) == ['existing@example.com', 'twice@example.com']
+
+
+def test_endpoint_returns_201_then_duplicate(group_commit, client):
+    response = client.post('/users/', json={'name': 'Ann', 'email': 'Ann@Example.com'})
+    assert response.status_code == 201
+    assert response.get_json()['email'] == 'ann@example.com'
+
+    response = client.post('/users/', json={'name': 'Ann', 'email': 'ann@example.com'})
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Email already registered'}
+
+
+def test_full_queue_returns_503(aiword, client, monkeypatch):
+    batcher = aiword.SignupBatcher(queue_size=1)
+    # Stand-in for a flush thread that is busy elsewhere, so nothing drains the queue.
+    batcher.thread = threading.current_thread()
+    batcher.submit(signup(aiword, 'queued@example.com'))
+    monkeypatch.setattr(aiword, 'USER_GROUP_COMMIT', True)
+    monkeypatch.setattr(aiword, 'signup_batcher', batcher)
+
+    response = client.post('/users/', json={'name': 'Bob', 'email': 'bob@example.com'})
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+
+
+def test_timed_out_signup_is_withdrawn(aiword, client, monkeypatch):
+    batcher = aiword.SignupBatcher(queue_size=10)
+    batcher.thread = threading.current_thread()
+    monkeypatch.setattr(aiword, 'USER_GROUP_COMMIT', True)
+    monkeypatch.setattr(aiword, 'USER_GROUP_COMMIT_WAIT_SECONDS', 0.05)
+    monkeypatch.setattr(aiword, 'signup_batcher', batcher)
+
+    response = client.post('/users/', json={'name': 'Cy', 'email': 'cy@example.com'})
+    assert response.status_code == 503
+
+    # The flush that picks the row up later must not write it: the client was told to retry.
+    row, future = batcher.queue.get_nowait()
+    with aiword.app.app_context():
+        batcher._flush([(row, future)])
+    assert future.cancelled()
+    assert user_emails(aiword) == []
+
+
+def test_close_drains_queued_signups(aiword):
+    batcher = aiword.SignupBatcher(max_rows=5, max_latency_ms=1000, queue_size=100)
+    futures = [batcher.submit(signup(aiword, f'drain{i}@example.com')) for i in range(12)]
+    batcher.close()
+
+    assert all(future.done() for future in futures)
+    assert len(user_emails(aiword)) == 12
+    with pytest.raises(queue.Full):
+        batcher.submit(signup(aiword, 'late@example.com'))
+
+
+@pytest.mark.parametrize('group_commit_on', [False, True])
+def test_too_long_values_are_rejected_in_both_modes(aiword, client, monkeypatch, group_commit_on):
+    monkeypatch.setattr(aiword, 'USER_GROUP_COMMIT', group_commit_on)
+    response = client.post('/users/', json={'name': 'x' * 101, 'email': 'long@example.com'})
+    assert response.status_code == 400
+    response = client.post('/users/', json={'name': 'Dee', 'email': 'd' * 120 + '@example.com'})
+    assert response.status_code == 400
+    assert user_emails(aiword) == []